@@ -0,0 +1,41 @@
+import django
+from django.core.handlers.asgi import ASGIHandler
+from django.urls import Resolver404, get_resolver
+
+
+def threadless(view):
+    """Mark an async view as served by ``StreamingASGIHandler`` without a thread of its own."""
+    view.threadless = True
+    return view
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """
+    ``ASGIHandler`` serving ``threadless`` views outside a ``ThreadSensitiveContext``.
+
+    Django runs each request in such a context, whose executor thread takes the request's thread-sensitive sync
+    calls, the ``request_started`` receivers at least, and lives until the response is complete. For a stream that
+    is the whole connection, so every open stream would hold a thread. Outside a context those brief calls share
+    asgiref's single thread instead, so threadless views must keep longer sync work off thread-sensitive calls.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self.is_threadless(scope):
+            await self.handle(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
+
+    @staticmethod
+    def is_threadless(scope):
+        path = scope["path"].removeprefix(scope.get("root_path", ""))
+        try:
+            match = get_resolver().resolve(path)
+        except Resolver404:
+            return False
+        return getattr(match.func, "threadless", False)
+
+
+def get_asgi_application():
+    """``django.core.asgi.get_asgi_application`` returning a ``StreamingASGIHandler``."""
+    django.setup(set_prefix=False)
+    return StreamingASGIHandler()
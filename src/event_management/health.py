@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+def check_database(alias):
+    """Run a trivial query on ``alias`` and describe the connection and, when pooled, the pool."""
+    connection = connections[alias]
+    pool = getattr(connection, "pool", None)
+    state = {
+        "vendor": connection.vendor,
+        "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+        # waiting/wait time, size/available and errors (checkout timeouts) of the psycopg pool.
+        "pool": pool.get_stats() if pool is not None else None,
+    }
+
+    start = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError as exc:
+        state.update(healthy=False, error=str(exc))
+    else:
+        state.update(healthy=True, latency_ms=round((time.perf_counter() - start) * 1000, 2))
+    return state
+
+
+class DatabaseHealthView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        databases = {alias: check_database(alias) for alias in connections}
+        healthy = all(database["healthy"] for database in databases.values())
+        return Response(
+            {"mode": settings.DB_POOL_MODE, "databases": databases},
+            status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
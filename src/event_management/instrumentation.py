@@ -0,0 +1,88 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import partial
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+LIST_RE = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+SPACE_RE = re.compile(r"\s+")
+
+
+def query_shape(sql):
+    """Reduce a statement to its shape: literals become ``?`` and placeholder lists of any length compare equal."""
+    sql = LITERAL_RE.sub("?", SPACE_RE.sub(" ", sql.strip()))
+    return LIST_RE.sub("(...)", sql)
+
+
+current_recorder = ContextVar("current_recorder", default=None)
+
+
+def record_queries(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install(connection, **kwargs):
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+# Every connection gets one permanent wrapper, which reports to the recorder of the context running the query.
+connection_created.connect(install)
+
+
+class QueryRecorder:
+    """
+    Records the queries run in the current context while active.
+
+    That covers the current thread and the threads ``sync_to_async`` runs the context's work on, such as the async
+    ORM's, so entering a recorder needs no hop to the thread that will query. Nested recorders all see the queries.
+    Queries sharing a shape more than ``QUERY_REPEAT_THRESHOLD`` times are reported as ``repeated``, the usual
+    signature of an N+1 access pattern.
+    """
+
+    def __init__(self, repeat_threshold=None):
+        self.repeat_threshold = settings.QUERY_REPEAT_THRESHOLD if repeat_threshold is None else repeat_threshold
+        self.queries = []
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.parent = None
+        self._token = None
+
+    def __enter__(self):
+        # Connections opened before this module was imported never went through connection_created.
+        for connection in connections.all(initialized_only=True):
+            install(connection)
+        self.parent = current_recorder.get()
+        self._token = current_recorder.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        current_recorder.reset(self._token)
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.parent is not None:
+            execute = partial(self.parent, execute)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.duration += duration
+            self.queries.append({"sql": sql, "duration": duration, "alias": context["connection"].alias})
+            self.shapes[query_shape(sql)] += 1
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def repeated(self):
+        return {shape: count for shape, count in self.shapes.items() if count > self.repeat_threshold}
@@ -0,0 +1,101 @@
+import json
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from event_management.instrumentation import QueryRecorder
+from event_management.routers import pin_to_primary, replica_reads
+
+logger = logging.getLogger("event_management.queries")
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Reports the SQL cost of every request.
+
+    The query count and total database time go out as a ``Server-Timing`` header and a JSON log line on the
+    ``event_management.queries`` logger; requests repeating a query shape are logged as warnings. It is async
+    capable, so async views served over ASGI are not pushed onto a thread by the middleware chain.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder)
+
+    async def __acall__(self, request):
+        # The recorder follows the request's context into whichever thread sync_to_async runs a query on, so it is
+        # entered right here: a hop to a thread-sensitive executor would pin a thread for every open stream.
+        with QueryRecorder() as recorder:
+            response = await self.get_response(request)
+        return self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        duration = recorder.duration * 1000
+        timing = f'db;dur={duration:.2f};desc="{recorder.count} queries"'
+        response["Server-Timing"] = f"{response['Server-Timing']}, {timing}" if "Server-Timing" in response else timing
+
+        repeated = recorder.repeated
+        level = logging.WARNING if repeated else logging.INFO
+        if logger.isEnabledFor(level):
+            record = {
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": response.status_code,
+                "queries": recorder.count,
+                "db_ms": round(duration, 2),
+                "repeated": [{"shape": shape, "count": count} for shape, count in repeated.items()],
+            }
+            logger.log(level, json.dumps(record))
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Scopes replica routing to a single request and pins users to the primary after a successful write.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = replica_reads.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = replica_reads.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        return self.pin(request, response)
+
+    def pin(self, request, response):
+        if request.method in ("GET", "HEAD", "OPTIONS") or response.status_code >= 400:
+            return response
+        # DRF authenticates inside the view and copies the user onto the request, so it is known by now.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user)
+        return response
@@ -0,0 +1,54 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+replica_reads = ContextVar("replica_reads", default=False)
+
+
+def use_replicas():
+    """Let the reads of the current request go to a replica."""
+    replica_reads.set(True)
+
+
+def reads_from_replica():
+    return bool(settings.DATABASE_REPLICAS) and replica_reads.get()
+
+
+def pin_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def pin_to_primary(user):
+    cache.set(pin_key(user.pk), True, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user):
+    return user.is_authenticated and cache.get(pin_key(user.pk), False)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to a random replica from ``DATABASE_REPLICAS`` when the request opted in, everything else to
+    ``default``.
+
+    Views opt in with ``use_replicas()``; ``ReplicaRoutingMiddleware`` resets the flag per request and pins users to
+    the primary for ``DATABASE_REPLICA_PIN_SECONDS`` after they write, so they always read their own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        if reads_from_replica():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas receive the schema through replication.
+        return db not in settings.DATABASE_REPLICAS
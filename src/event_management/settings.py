@@ -34,6 +34,7 @@ INSTALLED_APPS = [
     # Local apps
     "users",
     "events",
+    "notifications",
 ]
 
 MIDDLEWARE = [
@@ -44,6 +45,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "event_management.middleware.QueryInstrumentationMiddleware",
+    "event_management.middleware.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "event_management.urls"
@@ -77,6 +80,90 @@ DATABASES = {
     }
 }
 
+# "none" connects per request, "persistent" keeps one connection per thread for DB_CONN_MAX_AGE seconds and "pool"
+# shares a bounded psycopg pool per process. Both reusing modes check a connection's health before handing it out.
+DB_POOL_MODE = get_secret("DB_POOL_MODE", "none")
+
+if DB_POOL_MODE == "persistent":
+    DATABASES["default"]["CONN_MAX_AGE"] = int(get_secret("DB_CONN_MAX_AGE", 60))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+elif DB_POOL_MODE == "pool":
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(get_secret("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(get_secret("DB_POOL_MAX_SIZE", 10)),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": float(get_secret("DB_POOL_TIMEOUT", 10)),
+            "max_idle": float(get_secret("DB_POOL_MAX_IDLE", 600)),
+        }
+    }
+
+# Read replicas as JSON overrides of the default database settings, e.g. '[{"HOST": "replica-1"}]'.
+for number, replica in enumerate(json.loads(get_secret("DB_REPLICAS", "[]")), start=1):
+    DATABASES[f"replica_{number}"] = {**DATABASES["default"], **replica, "TEST": {"MIRROR": "default"}}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["event_management.routers.ReplicaRouter"]
+
+# Seconds a user's reads stay on the primary after a write, longer than the replication lag.
+DATABASE_REPLICA_PIN_SECONDS = int(get_secret("DB_REPLICA_PIN_SECONDS", 5))
+
+# Several worker processes must share one cache (e.g. django.core.cache.backends.redis.RedisCache), or each keeps its
+# own response cache, replica pins and throttle counters.
+CACHES = {
+    "default": {
+        "BACKEND": get_secret("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": get_secret("CACHE_LOCATION", "event-management"),
+    }
+}
+
+# Seconds an anonymous event list/detail response may stay cached; writes invalidate it immediately.
+EVENT_CACHE_TIMEOUT = int(get_secret("EVENT_CACHE_TIMEOUT", 300))
+
+# Seconds /api/events/changes/ holds back fresh writes so transactions committing out of order are not skipped.
+EVENT_SYNC_LAG = float(get_secret("EVENT_SYNC_LAG", 2))
+
+# Days the tombstones of deleted events are kept for /api/events/changes/. Clients whose last sync is older must
+# resync from scratch; the prune_tombstones command deletes older tombstones.
+EVENT_TOMBSTONE_RETENTION_DAYS = int(get_secret("EVENT_TOMBSTONE_RETENTION_DAYS", 30))
+
+# Seconds a rendered iCalendar feed and its token lookup stay cached; changes to the feed invalidate it sooner.
+EVENT_FEED_CACHE_TIMEOUT = int(get_secret("EVENT_FEED_CACHE_TIMEOUT", 86400))
+
+# Dotted path to the pub/sub backend pushing event changes to /api/async/events/{id}/stream/ subscribers; PostgreSQL
+# LISTEN/NOTIFY across all worker processes by default, in-process on other databases.
+EVENT_STREAM_BROKER = get_secret("EVENT_STREAM_BROKER")
+
+# Threads per process reading event snapshots for all open streams, so open streams never hold a thread each.
+EVENT_STREAM_READ_THREADS = int(get_secret("EVENT_STREAM_READ_THREADS", 4))
+
+# Seconds an event stream waits after an update before the next one, coalescing the changes made meanwhile.
+EVENT_STREAM_INTERVAL = float(get_secret("EVENT_STREAM_INTERVAL", 0.25))
+
+# Seconds of silence after which an event stream sends a keepalive comment.
+EVENT_STREAM_KEEPALIVE = float(get_secret("EVENT_STREAM_KEEPALIVE", 15))
+
+# Milliseconds EventSource clients wait before reconnecting a dropped stream.
+EVENT_STREAM_RETRY = int(get_secret("EVENT_STREAM_RETRY", 3000))
+
+# Days after which the archive_events command moves an event into the archive tables. List requests whose date
+# range starts before this horizon also read the archive.
+EVENT_ARCHIVE_AFTER_DAYS = int(get_secret("EVENT_ARCHIVE_AFTER_DAYS", 365))
+
+# Executions of one query shape within a request above which it is reported as a likely N+1.
+QUERY_REPEAT_THRESHOLD = int(get_secret("QUERY_REPEAT_THRESHOLD", 5))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        # INFO logs the SQL cost of every request, the WARNING default only requests repeating queries.
+        "event_management.queries": {"handlers": ["console"], "level": get_secret("QUERY_LOG_LEVEL", "WARNING")},
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -94,6 +181,13 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "users.CustomUserModel"
 
+AUTHENTICATION_BACKENDS = ["users.backends.PooledModelBackend"]
+
+# Threads hashing passwords for sign-ups and logins, and how many more requests may wait for one before the rest are
+# rejected with a 503. Four waiting requests per thread keep the wait at about four hashes whatever the core count.
+PASSWORD_HASH_WORKERS = int(get_secret("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE = int(get_secret("PASSWORD_HASH_QUEUE", 4 * PASSWORD_HASH_WORKERS))
+
 LANGUAGE_CODE = "en-us"
 
 TIME_ZONE = "UTC"
@@ -112,6 +206,12 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "event_management.exceptions.exception_handler",
     "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    # Requests per user, or per IP when anonymous, counted in the cache; see event_management.throttling.
+    "DEFAULT_THROTTLE_RATES": {
+        "register": get_secret("THROTTLE_REGISTER_RATE", "30/min"),
+        "token": get_secret("THROTTLE_TOKEN_RATE", "10/min"),
+        "user_create": get_secret("THROTTLE_USER_CREATE_RATE", "5/hour"),
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -121,6 +221,9 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+# Dotted path to a DRF filter backend handling ``?search=`` on events; PostgreSQL full-text search by default.
+EVENT_SEARCH_BACKEND = get_secret("EVENT_SEARCH_BACKEND")
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
 }
@@ -0,0 +1,20 @@
+from contextlib import contextmanager
+
+from event_management.instrumentation import QueryRecorder
+
+
+class QueryBudgetMixin:
+    """``TestCase`` mixin locking in how many queries a block of code may run."""
+
+    @contextmanager
+    def assertMaxQueries(self, num, repeat_threshold=None):
+        """Fail if the block runs more than ``num`` queries or repeats any query shape more than the threshold."""
+        with QueryRecorder(repeat_threshold) as recorder:
+            yield recorder
+
+        if recorder.count > num:
+            queries = "\n".join(f"{i}. {query['sql']}" for i, query in enumerate(recorder.queries, start=1))
+            self.fail(f"{recorder.count} queries executed, at most {num} expected.\nCaptured queries were:\n{queries}")
+        if recorder.repeated:
+            shapes = "\n".join(f"{count}x {shape}" for shape, count in recorder.repeated.items())
+            self.fail(f"Repeated queries executed:\n{shapes}")
@@ -0,0 +1,160 @@
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from event_management.throttling import RegisterRateThrottle, TokenRateThrottle
+from events.models import Event
+
+User = get_user_model()
+
+
+class DatabaseHealthViewTest(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.url = reverse("database-health")
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="testpass123", is_staff=True
+        )
+        cls.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpass123")
+
+    def test_database_health_success(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["mode"], settings.DB_POOL_MODE)
+        database = response.data["databases"]["default"]
+        self.assertTrue(database["healthy"])
+        self.assertGreaterEqual(database["latency_ms"], 0)
+        self.assertIsNone(database["pool"])
+
+    def test_database_unhealthy_fail(self):
+        self.client.force_authenticate(user=self.admin)
+        with patch("event_management.health.connections") as connections:
+            connections.__iter__.return_value = ["default"]
+            connection = connections.__getitem__.return_value
+            connection.vendor = "postgresql"
+            connection.settings_dict = {"CONN_MAX_AGE": 60}
+            connection.pool.get_stats.return_value = {"pool_size": 10, "requests_waiting": 3, "requests_errors": 1}
+            connection.cursor.side_effect = OperationalError("connection refused")
+
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        database = response.data["databases"]["default"]
+        self.assertFalse(database["healthy"])
+        self.assertEqual(database["error"], "connection refused")
+        self.assertEqual(database["pool"]["requests_waiting"], 3)
+
+    def test_database_health_non_admin_fail(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+THROTTLE_RATES = {"register": "2/min", "token": "2/min", "user_create": "1/hour"}
+
+
+@override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": THROTTLE_RATES})
+class ThrottlingTest(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="testuser", email="test@example.com", password="testpass123")
+        cls.other = User.objects.create_user(username="testuser2", email="test2@example.com", password="testpass123")
+        cls.organizer = User.objects.create_user(username="organizer", email="org@example.com", password="testpass123")
+        cls.events = [
+            Event.objects.create(
+                title=f"Event {i}",
+                description="Description",
+                date=timezone.now(),
+                location="Riga",
+                organizer=cls.organizer,
+            )
+            for i in range(4)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def register(self, user, event):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse("event-register", kwargs={"pk": event.id}))
+
+    def test_register_throttled_fail(self):
+        self.assertEqual(self.register(self.user, self.events[0]).status_code, status.HTTP_201_CREATED)
+        # Rejected registrations count too.
+        self.assertEqual(self.register(self.user, self.events[0]).status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.register(self.user, self.events[1])
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertTrue(1 <= int(response["Retry-After"]) <= 60)
+        self.assertIn("Request was throttled.", response.data["message"])
+        self.assertFalse(self.events[1].participants.exists())
+
+    def test_register_throttled_per_user_success(self):
+        self.register(self.user, self.events[0])
+        self.register(self.user, self.events[1])
+
+        self.assertEqual(self.register(self.other, self.events[2]).status_code, status.HTTP_201_CREATED)
+        # Other endpoints keep their own budget.
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(reverse("event-list")).status_code, status.HTTP_200_OK)
+
+    def test_token_throttled_per_ip_fail(self):
+        url = reverse("token_obtain_pair")
+        data = {"username": "testuser", "password": "wrongpass"}
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, data).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(url, {"username": "testuser", "password": "testpass123"})
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(self.client.post(url, data, REMOTE_ADDR="10.0.0.2").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_create_throttled_fail(self):
+        url = reverse("user-create")
+        self.client.post(url, {"username": "new"}, format="json")
+
+        response = self.client.post(url, {"username": "new"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertTrue(int(response["Retry-After"]) <= 3600)
+
+    def test_window_resets_success(self):
+        request = APIRequestFactory().post("/")
+        request.user = self.user
+        throttle = RegisterRateThrottle()
+        with patch.object(RegisterRateThrottle, "timer", return_value=120.0):
+            self.assertTrue(throttle.allow_request(request, None))
+            self.assertTrue(throttle.allow_request(request, None))
+            self.assertFalse(throttle.allow_request(request, None))
+        with patch.object(RegisterRateThrottle, "timer", return_value=179.5):
+            # A second worker sees the same counter.
+            other = RegisterRateThrottle()
+            self.assertFalse(other.allow_request(request, None))
+            self.assertEqual(other.wait(), 1)
+        with patch.object(RegisterRateThrottle, "timer", return_value=180.0):
+            self.assertTrue(throttle.allow_request(request, None))
+
+    def test_unconfigured_scope_not_throttled_success(self):
+        request = APIRequestFactory().post("/")
+        request.user = self.user
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}):
+            throttle = TokenRateThrottle()
+
+        self.assertTrue(all(throttle.allow_request(request, None) for _ in range(10)))
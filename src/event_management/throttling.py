@@ -0,0 +1,99 @@
+import math
+import os
+
+from django.core import checks
+from django.core.cache import cache as default_cache
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class CacheRateThrottle(SimpleRateThrottle):
+    """
+    Fixed-window throttle counting requests with an atomic ``cache.incr``, per user or per IP for anonymous requests.
+
+    DRF's ``SimpleRateThrottle`` reads a timestamp list and writes it back, two round trips during which concurrent
+    workers overwrite each other's requests. Here a check is one increment, except for the first request of a
+    window, and every worker sharing the cache counts against the same total.
+    """
+
+    cache = default_cache
+    cache_format = "throttle:%(scope)s:%(ident)s:%(window)s"
+
+    def get_rate(self):
+        # Read when the throttle is built rather than at import, and a scope without a rate is not throttled.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        ident = request.user.pk if request.user and request.user.is_authenticated else self.get_ident(request)
+        window = int(self.now // self.duration)
+        return self.cache_format % {"scope": self.scope, "ident": ident, "window": window}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.now = self.timer()
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        try:
+            count = self.cache.incr(self.key)
+        except ValueError:
+            # The window's first request; add() only fails when another worker created the counter meanwhile.
+            if self.cache.add(self.key, 1, timeout=self.duration):
+                count = 1
+            else:
+                count = self.cache.incr(self.key)
+        return count <= self.num_requests
+
+    def wait(self):
+        # The counter resets when the window ends, whatever the requests before it.
+        return math.ceil(self.duration - self.now % self.duration)
+
+
+class RegisterRateThrottle(CacheRateThrottle):
+    scope = "register"
+
+
+class TokenRateThrottle(CacheRateThrottle):
+    # Every token request runs the password hasher, so these are the cheapest requests to flood the server with.
+    scope = "token"
+
+
+class UserCreateRateThrottle(CacheRateThrottle):
+    scope = "user_create"
+
+
+def counts_per_process():
+    return isinstance(caches["default"], LocMemCache) and any(api_settings.DEFAULT_THROTTLE_RATES.values())
+
+
+@checks.register(checks.Tags.caches)
+def check_throttle_cache(app_configs=None, **kwargs):
+    # uvicorn and gunicorn start WEB_CONCURRENCY worker processes, each counting requests in a cache of its own.
+    workers = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    if workers > 1 and counts_per_process():
+        return [
+            checks.Error(
+                f"Rate limits are counted in a local-memory cache, so each of the {workers} workers allows the full rate.",
+                hint="Set CACHE_BACKEND to a cache shared between the workers, e.g. Redis.",
+                id="event_management.E001",
+            )
+        ]
+    return []
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_throttle_cache_deploy(app_configs=None, **kwargs):
+    if counts_per_process():
+        return [
+            checks.Warning(
+                "Rate limits are counted in a local-memory cache and only hold while a single worker process serves.",
+                hint="Set CACHE_BACKEND to a cache shared between the workers, e.g. Redis.",
+                id="event_management.W001",
+            )
+        ]
+    return []
@@ -1,11 +1,15 @@
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
 
+from event_management.health import DatabaseHealthView
+from event_management.throttling import TokenRateThrottle
+
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("api/token/", TokenObtainPairView.as_view(throttle_classes=[TokenRateThrottle]), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/token/verify/", TokenVerifyView.as_view(), name="token_verify"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -14,6 +18,11 @@ urlpatterns = [
         SpectacularSwaggerView.as_view(url_name="schema"),
         name="swagger-ui",
     ),
+    path("api/health/db/", DatabaseHealthView.as_view(), name="database-health"),
     path("api/users/", include("users.urls")),
     path("api/events/", include("events.urls")),
+    path("api/async/events/", include("events.async_urls")),
 ]
+
+# uvicorn serves no static files; with DEBUG on Django serves the admin's, as runserver did.
+urlpatterns += staticfiles_urlpatterns()
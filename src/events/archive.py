@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from events.models import ArchivedEvent, ArchivedEventRegistration, Event, EventRegistration
+
+# Every column an archived event shares with its hot row.
+EVENT_FIELDS = [field.attname for field in ArchivedEvent._meta.concrete_fields if field.name != "archived_at"]
+
+
+def archive_horizon():
+    """Events dated before this moment belong in the archive."""
+    return timezone.now() - timedelta(days=settings.EVENT_ARCHIVE_AFTER_DAYS)
+
+
+def reaches_archive(start_date, end_date):
+    """Whether a list filtered to ``start_date``/``end_date`` can match archived events."""
+    if start_date is not None:
+        return start_date < archive_horizon()
+    # Only an end date leaves the range open towards the past.
+    return end_date is not None
+
+
+def archive_events(before, batch_size):
+    """
+    Move up to ``batch_size`` events dated before ``before`` into the archive tables, with their registrations.
+
+    Each batch is copied and removed in one short transaction, so readers see every event in exactly one of the
+    tables. Returns the number of events moved.
+    """
+    with transaction.atomic(using=router.db_for_write(Event)):
+        # SKIP LOCKED leaves events in the middle of a registration to a later run.
+        events = list(
+            Event.objects.select_for_update(skip_locked=True)
+            .filter(date__lt=before)
+            # A series is archived once its last occurrence is past, open-ended ones never are.
+            .filter(Q(recurrence="") | Q(recurrence_end__lt=before))
+            .order_by("date", "id")
+            .values(*EVENT_FIELDS)[:batch_size]
+        )
+        if not events:
+            return 0
+
+        event_ids = [event["id"] for event in events]
+        registrations = EventRegistration.objects.filter(event_id__in=event_ids)
+        ArchivedEvent.objects.bulk_create([ArchivedEvent(**event) for event in events])
+        ArchivedEventRegistration.objects.bulk_create(
+            [
+                ArchivedEventRegistration(**row)
+                for row in registrations.values("id", "user_id", "event_id", "occurrence")
+            ],
+            batch_size=batch_size,
+        )
+
+        # A raw DELETE skips the delete signals: the events still exist for sync clients, so they get no
+        # tombstones, and their participant counts move to the archive untouched.
+        registrations._raw_delete(registrations.db)
+        events = Event.objects.filter(id__in=event_ids)
+        events._raw_delete(events.db)
+    return len(event_ids)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from events import async_views
+
+urlpatterns = [
+    path("", async_views.event_list, name="async-event-list"),
+    path("<str:pk>/", async_views.event_detail, name="async-event-detail"),
+    path("<str:pk>/stream/", async_views.event_stream, name="async-event-stream"),
+]
@@ -0,0 +1,118 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from event_management.exceptions import exception_handler
+from event_management.handlers import threadless
+from event_management.routers import is_pinned, use_replicas
+from events.live import get_broker, read_snapshot, stream
+from events.models import ArchivedEvent, Event
+from events.views import EventViewSet
+
+
+class StreamingUnavailable(APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "Live updates are only served over ASGI."
+    default_code = "streaming_unavailable"
+
+
+def render(response):
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = JSONRenderer.media_type
+    response.renderer_context = {}
+    return response.render()
+
+
+async def get_view(request, action, **kwargs):
+    """
+    Build an ``EventViewSet`` for ``request`` so the async views share its filters, pagination and serializer.
+
+    JWT authentication is the only step needing a query; it runs in a worker thread up front, after which every
+    filter backend only composes the queryset.
+    """
+    request = Request(request, authenticators=())
+    result = await sync_to_async(JWTAuthentication().authenticate)(request)
+    request.user = result[0] if result else AnonymousUser()
+    if not is_pinned(request.user):
+        use_replicas()
+    return EventViewSet(request=request, action=action, args=(), kwargs=kwargs, format_kwarg=None)
+
+
+def handle_errors(view_func):
+    @wraps(view_func)
+    async def wrapper(request, **kwargs):
+        try:
+            return await view_func(request, **kwargs)
+        except (APIException, Http404) as exc:
+            return render(exception_handler(exc, {"request": request}))
+
+    return wrapper
+
+
+@require_safe
+@handle_errors
+async def event_list(request):
+    view = await get_view(request, "list")
+    pages = [view.paginator.get_page_queryset(queryset, view.request, view) for queryset in view.get_list_querysets()]
+    events = view.paginator.merge_pages([[event async for event in page] for page in pages])
+    return render(view.paginator.get_paginated_response(view.get_serializer(events, many=True).data))
+
+
+@require_safe
+@handle_errors
+async def event_detail(request, pk):
+    view = await get_view(request, "retrieve", pk=pk)
+    not_found = Http404(f"No {Event._meta.object_name} matches the given query.")
+    try:
+        pk = Event._meta.pk.to_python(pk)
+    except DjangoValidationError:
+        raise not_found
+    event = await view.get_queryset().filter(pk=pk).afirst()
+    if event is None:
+        # Archived events stay readable at their old URL, as in EventViewSet.get_object.
+        archived = ArchivedEvent.objects.select_related("organizer").defer("search_vector")
+        event = await archived.filter(pk=pk).afirst()
+    if event is None:
+        raise not_found
+    return render(Response(view.get_serializer(event).data))
+
+
+@threadless
+@require_safe
+@handle_errors
+async def event_stream(request, pk):
+    """
+    Push an event's changes as Server-Sent Events over one long-lived connection, instead of clients polling
+    ``event_detail`` while registrations open.
+    """
+    if not isinstance(request, ASGIRequest):
+        # A WSGI server would collect the endless stream into a list before sending anything.
+        raise StreamingUnavailable()
+    not_found = Http404(f"No {Event._meta.object_name} matches the given query.")
+    try:
+        event_id = Event._meta.pk.to_python(pk)
+    except DjangoValidationError:
+        raise not_found
+    # Subscribed before the first read, so no change can slip in between.
+    subscription = get_broker().subscribe(event_id)
+    snapshot = await read_snapshot(event_id)
+    if not snapshot:
+        subscription.close()
+        raise not_found
+
+    response = StreamingHttpResponse(stream(subscription, snapshot), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stops nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,154 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from event_management.instrumentation import QueryRecorder
+from events.models import Event
+from events.seeding import LOCATIONS, WORDS
+
+User = get_user_model()
+
+LATENCY_METRICS = ("p50", "p95", "p99")
+
+
+class Context:
+    """What the scenarios need to build their requests: authenticated clients and target events."""
+
+    def __init__(self, rng, size):
+        self.rng = rng
+        self.now = timezone.now()
+        users = list(User.objects.order_by("?")[:size])
+        self.clients = [self.authenticated_client(user) for user in users]
+        self.event_ids = list(Event.objects.order_by("?").values_list("id", flat=True)[:size])
+        self.open_event = Event.objects.create(
+            title="Benchmark registration", description="Open event", date=self.now, location="Riga"
+        )
+        self.registrations = iter(self.clients)
+
+    @staticmethod
+    def authenticated_client(user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return client
+
+    def client(self):
+        return self.rng.choice(self.clients)
+
+
+def list_events(context):
+    return context.client().get(reverse("event-list"))
+
+
+def list_events_anonymous(context):
+    return APIClient().get(reverse("event-list"))
+
+
+def search_events(context):
+    return context.client().get(reverse("event-list"), {"search": context.rng.choice(WORDS)})
+
+
+def list_organized_by_me(context):
+    return context.client().get(reverse("event-list"), {"organized_by_me": "true"})
+
+
+def list_participated_by_me(context):
+    return context.client().get(reverse("event-list"), {"participated_by_me": "true"})
+
+
+def list_date_range(context):
+    start = context.now + timedelta(days=context.rng.randint(-300, 300))
+    params = {"start_date": start.isoformat(), "end_date": (start + timedelta(days=30)).isoformat()}
+    return context.client().get(reverse("event-list"), params)
+
+
+def list_near(context):
+    latitude, longitude = LOCATIONS[context.rng.choice(list(LOCATIONS))]
+    return context.client().get(reverse("event-list"), {"near": f"{latitude},{longitude}", "radius": 5})
+
+
+def retrieve_event(context):
+    return context.client().get(reverse("event-detail", kwargs={"pk": context.rng.choice(context.event_ids)}))
+
+
+def register(context):
+    # Every user registers once; when the sample runs out the repeats measure the conflict path.
+    client = next(context.registrations, None) or context.client()
+    return client.post(reverse("event-register", kwargs={"pk": context.open_event.pk}))
+
+
+SCENARIOS = {
+    "list": list_events,
+    "list_anonymous": list_events_anonymous,
+    "search": search_events,
+    "organized_by_me": list_organized_by_me,
+    "participated_by_me": list_participated_by_me,
+    "date_range": list_date_range,
+    "near": list_near,
+    "detail": retrieve_event,
+    "register": register,
+}
+
+
+def unthrottled():
+    """Lift the rate limits, which would otherwise answer most of a scenario's repeated requests with a 429."""
+    rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+    return override_settings(REST_FRAMEWORK=rest_framework)
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, round(percent / 100 * (len(values) - 1)))]
+
+
+def measure(scenario, context, requests, warmup=0):
+    """Run ``scenario`` ``requests`` times after ``warmup`` unmeasured runs and summarize its cost."""
+    timings, queries, errors = [], [], 0
+    for i in range(warmup + requests):
+        with QueryRecorder() as recorder:
+            start = time.perf_counter()
+            response = scenario(context)
+            elapsed = time.perf_counter() - start
+        if i < warmup:
+            continue
+        timings.append(elapsed * 1000)
+        queries.append(recorder.count)
+        # A throttled request never reached the endpoint, its timing would flatter the results.
+        errors += response.status_code >= 500 or response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    return {
+        "requests": requests,
+        "p50": percentile(timings, 50),
+        "p95": percentile(timings, 95),
+        "p99": percentile(timings, 99),
+        "mean": statistics.fmean(timings),
+        "throughput": requests / (sum(timings) / 1000),
+        "queries": max(queries),
+        "errors": errors,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return a description of every metric that regressed past ``threshold`` relative to ``baseline``."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        for metric in LATENCY_METRICS:
+            limit = expected[metric] * (1 + threshold)
+            if result[metric] > limit:
+                regressions.append(f"{name}: {metric} {result[metric]:.2f}ms > {limit:.2f}ms")
+        if result["queries"] > expected["queries"]:
+            regressions.append(f"{name}: {result['queries']} queries > {expected['queries']}")
+        if result["errors"]:
+            regressions.append(f"{name}: {result['errors']} failed request(s)")
+    return regressions
@@ -0,0 +1,119 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from rest_framework.response import Response
+
+from event_management.routers import reads_from_replica
+from events.conditional import normalized_url, not_modified_response, set_validators
+
+GENERATION_KEY = "events:generation"
+LIST_VERSION_KEY = "events:version"
+HITS_KEY = "events:cache:hits"
+MISSES_KEY = "events:cache:misses"
+
+
+def event_version_key(event_id):
+    return f"events:version:{event_id}"
+
+
+def user_feeds_version_key(user_id):
+    return f"events:feeds:version:{user_id}"
+
+
+def new_version():
+    # Time based rather than incremented, so an evicted version can never come back and revive old entries.
+    return time.time_ns()
+
+
+def get_versions(*keys):
+    versions = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+    return [versions.get(key) or missing[key] for key in keys]
+
+
+def bump_versions(*keys):
+    # Bumped after the commit: a reader racing the write can only cache stale data under the old version.
+    transaction.on_commit(lambda: cache.set_many({key: new_version() for key in keys}, timeout=None))
+
+
+def invalidate_event(event_id):
+    bump_versions(LIST_VERSION_KEY, event_version_key(event_id))
+
+
+def invalidate_user_feeds(*user_ids):
+    bump_versions(*(user_feeds_version_key(user_id) for user_id in user_ids if user_id is not None))
+
+
+def invalidate_all():
+    bump_versions(GENERATION_KEY, LIST_VERSION_KEY)
+
+
+def response_cache_key(request, versions):
+    url = normalized_url(request)
+    digest = hashlib.sha256(url.encode()).hexdigest()
+    return "events:response:%s:%s" % (":".join(str(version) for version in versions), digest)
+
+
+def record(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_stats():
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = stats.get(HITS_KEY, 0), stats.get(MISSES_KEY, 0)
+    return {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+
+
+def cache_timeout():
+    # A lagging replica can serve pre-write data after the versions were bumped; caching it only for the pin
+    # window bounds how long that stays visible.
+    if reads_from_replica():
+        return min(settings.EVENT_CACHE_TIMEOUT, settings.DATABASE_REPLICA_PIN_SECONDS)
+    return settings.EVENT_CACHE_TIMEOUT
+
+
+def cached_response(request, version_keys, validators, render):
+    """
+    Serve a read with conditional GET support, from the cache for anonymous users.
+
+    ``validators`` returns the ``(etag, last_modified)`` of the current data, or ``None`` when there is nothing to
+    serve. Cache entries keep the validators they were rendered with, so a hit or a 304 on a hit costs no query.
+    Entries are keyed on the normalized query string and the current versions, so a write makes them unreachable
+    instead of having to find and delete them. Reads inside a transaction bypass the cache, their data may still
+    be rolled back.
+    """
+    cacheable = not (request.user.is_authenticated or connection.in_atomic_block)
+    if cacheable:
+        key = response_cache_key(request, get_versions(*version_keys))
+        entry = cache.get(key)
+        if entry is not None:
+            record(HITS_KEY)
+            etag, last_modified = entry["etag"], entry["last_modified"]
+            response = not_modified_response(request, etag, last_modified)
+            if response is None:
+                response = Response(entry["data"], headers={"X-Cache": "HIT"})
+            return set_validators(response, etag, last_modified)
+        record(MISSES_KEY)
+
+    state = validators()
+    if state is None:
+        return render()
+
+    etag, last_modified = state
+    response = not_modified_response(request, etag, last_modified)
+    if response is None:
+        response = render()
+        if cacheable and response.status_code == 200:
+            entry = {"data": response.data, "etag": etag, "last_modified": last_modified}
+            cache.set(key, entry, timeout=cache_timeout())
+            response["X-Cache"] = "MISS"
+    return set_validators(response, etag, last_modified)
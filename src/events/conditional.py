@@ -0,0 +1,28 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+def normalized_url(request):
+    params = sorted((key, value) for key, values in request.query_params.lists() for value in values)
+    return f"{request.scheme}://{request.get_host()}{request.path}?{urlencode(params)}"
+
+
+def make_etag(request, *state):
+    """Strong ETag over the row state plus everything else that shapes the response body."""
+    signature = [normalized_url(request), request.accepted_renderer.format, request.user.pk, *state]
+    return quote_etag(hashlib.sha256(repr(signature).encode()).hexdigest())
+
+
+def not_modified_response(request, etag, last_modified):
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
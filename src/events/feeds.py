@@ -0,0 +1,174 @@
+import hashlib
+import secrets
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.utils import timezone
+from django.utils.cache import quote_etag
+from django.views.decorators.http import require_safe
+
+from events.cache import GENERATION_KEY, event_version_key, get_versions, new_version, user_feeds_version_key
+from events.conditional import not_modified_response
+from events.models import CalendarFeed, Event, EventRegistration
+from events.recurrence import parse_rule
+
+FEED_KINDS = ("participating", "organized")
+FEED_NAMES = {"participating": "Events I attend", "organized": "Events I organize"}
+PRODID = "-//Event Management//Events//EN"
+
+
+def token_key(token):
+    # Hashed, so the secret never appears in cache keys or cache server logs.
+    return "events:feeds:token:%s" % hashlib.sha256(token.encode()).hexdigest()
+
+
+def feed_key(token, kind):
+    return "events:feeds:feed:%s:%s" % (hashlib.sha256(token.encode()).hexdigest(), kind)
+
+
+def get_feed(user):
+    return CalendarFeed.objects.get_or_create(user=user, defaults={"token": secrets.token_urlsafe(32)})[0]
+
+
+def rotate_feed(user):
+    """Give ``user`` a new feed token; the URLs shared with calendar apps before stop working."""
+    feed = get_feed(user)
+    old_token, feed.token = feed.token, secrets.token_urlsafe(32)
+    feed.save(update_fields=["token"])
+    transaction.on_commit(
+        lambda: cache.delete_many([token_key(old_token), *(feed_key(old_token, kind) for kind in FEED_KINDS)])
+    )
+    return feed
+
+
+def escape(value):
+    for char, escaped in (("\\", "\\\\"), (";", "\\;"), (",", "\\,"), ("\r\n", "\\n"), ("\n", "\\n")):
+        value = value.replace(char, escaped)
+    return value
+
+
+def fold(line):
+    # Content lines are limited to 75 octets, continuations start with a space; UTF-8 sequences are never split.
+    data = line.encode()
+    lines = []
+    while len(data) > 75 - bool(lines):
+        cut = 75 - bool(lines)
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        lines.append(data[:cut])
+        data = data[cut:]
+    lines.append(data)
+    return "\r\n ".join(part.decode() for part in lines)
+
+
+def format_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def render_event(event, occurrence=None):
+    uid = f"event-{event.id}" if occurrence is None else f"event-{event.id}-{format_datetime(occurrence)}"
+    lines = ["BEGIN:VEVENT", f"UID:{uid}@event-management", f"DTSTAMP:{format_datetime(event.updated_at)}"]
+
+    tz = timezone.get_default_timezone()
+    if event.recurrence and occurrence is None:
+        # Series repeat at the wall-clock time of TIME_ZONE, so calendar apps must expand them there too.
+        if str(tz) == "UTC":
+            lines.append(f"DTSTART:{format_datetime(event.date)}")
+        else:
+            lines.append(f"DTSTART;TZID={tz}:{timezone.localtime(event.date, tz):%Y%m%dT%H%M%S}")
+        lines.append(f"RRULE:{parse_rule(event.recurrence)}")
+    else:
+        lines.append(f"DTSTART:{format_datetime(occurrence or event.date)}")
+
+    lines += [f"SUMMARY:{escape(event.title)}", f"DESCRIPTION:{escape(event.description)}"]
+    lines.append(f"LOCATION:{escape(event.location)}")
+    if event.latitude is not None and event.longitude is not None:
+        lines.append(f"GEO:{event.latitude};{event.longitude}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def render_feed(kind, entries):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN"]
+    lines.append(f"X-WR-CALNAME:{FEED_NAMES[kind]}")
+    for event, occurrence in entries:
+        lines += render_event(event, occurrence)
+    lines.append("END:VCALENDAR")
+    return "".join(fold(line) + "\r\n" for line in lines)
+
+
+def feed_entries(user_id, kind):
+    """Return the ``(event, occurrence)`` pairs of a feed; series are expanded by the calendar app."""
+    if kind == "organized":
+        events = Event.objects.filter(organizer_id=user_id).defer("search_vector").order_by("date", "id")
+        return [(event, None) for event in events]
+    registrations = (
+        EventRegistration.objects.filter(user_id=user_id)
+        .select_related("event")
+        .defer("event__search_vector")
+        .order_by("event__date", "event_id", "occurrence")
+    )
+    return [(registration.event, registration.occurrence) for registration in registrations]
+
+
+def build_feed(user_id, kind, versions):
+    """
+    Render a feed into a cache entry, along with whether it may be cached.
+
+    The entry records the versions of the user's feeds and of every event in it, so any change to them makes it
+    stale. Versions are bump timestamps: one newer than the start of the render means a write committed while it
+    ran, so the rendered data may predate it and the entry is served but not cached.
+    """
+    started = new_version()
+    entries = feed_entries(user_id, kind)
+    event_ids = sorted({event.id for event, _ in entries})
+    event_versions = get_versions(*(event_version_key(event_id) for event_id in event_ids))
+    body = render_feed(kind, entries)
+    entry = {
+        "versions": versions,
+        "event_ids": event_ids,
+        "event_versions": event_versions,
+        "body": body,
+        "etag": quote_etag(hashlib.sha256(body.encode()).hexdigest()),
+    }
+    return entry, all(version < started for version in [*versions, *event_versions])
+
+
+def is_current(entry, versions):
+    if entry is None or entry["versions"] != versions:
+        return False
+    return get_versions(*(event_version_key(event_id) for event_id in entry["event_ids"])) == entry["event_versions"]
+
+
+@require_safe
+def calendar_feed(request, token, kind):
+    """
+    Serve an iCalendar feed of the token owner's events.
+
+    Calendar apps poll feeds every few minutes, so a poll of an unchanged feed is answered from the cache alone, or
+    with a 304 when the app sends back the ETag.
+    """
+    user_id = cache.get(token_key(token))
+    if user_id is None:
+        user_id = CalendarFeed.objects.filter(token=token).values_list("user_id", flat=True).first()
+        if user_id is None:
+            raise Http404("No calendar feed matches the given token.")
+        cache.set(token_key(token), user_id, timeout=settings.EVENT_FEED_CACHE_TIMEOUT)
+
+    versions = get_versions(GENERATION_KEY, user_feeds_version_key(user_id))
+    key = feed_key(token, kind)
+    entry = cache.get(key)
+    if not is_current(entry, versions):
+        entry, cacheable = build_feed(user_id, kind, versions)
+        if cacheable:
+            cache.set(key, entry, timeout=settings.EVENT_FEED_CACHE_TIMEOUT)
+
+    response = not_modified_response(request, entry["etag"], None)
+    if response is None:
+        response = HttpResponse(entry["body"], content_type="text/calendar; charset=utf-8")
+    response["ETag"] = entry["etag"]
+    response["Cache-Control"] = "private, no-cache"
+    return response
@@ -1,20 +1,58 @@
 import django_filters
+from django import forms
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef
 
+from events.geo import filter_within
 from events.models import Event
 
 User = get_user_model()
 
 
+class PointField(forms.CharField):
+    default_error_messages = {"invalid": "Enter a point as latitude,longitude."}
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if not value:
+            return None
+        try:
+            latitude, longitude = (float(part) for part in value.split(","))
+        except ValueError:
+            raise forms.ValidationError(self.error_messages["invalid"], code="invalid")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise forms.ValidationError(self.error_messages["invalid"], code="invalid")
+        return latitude, longitude
+
+
+class PointFilter(django_filters.Filter):
+    field_class = PointField
+
+
 class EventFilter(django_filters.FilterSet):
     start_date = django_filters.DateTimeFilter(field_name="date", lookup_expr="gte")
     end_date = django_filters.DateTimeFilter(field_name="date", lookup_expr="lte")
     organized_by_me = django_filters.BooleanFilter(method="filter_organized_by_me")
     participated_by_me = django_filters.BooleanFilter(method="filter_participated_by_me")
+    min_participants = django_filters.NumberFilter(field_name="participant_count", lookup_expr="gte")
+    max_participants = django_filters.NumberFilter(field_name="participant_count", lookup_expr="lte")
+    near = PointFilter(method="filter_near")
+    radius = django_filters.NumberFilter(method="filter_radius", min_value=0, max_value=20000)
+
+    default_radius = 10
 
     class Meta:
         model = Event
-        fields = ["start_date", "end_date", "organized_by_me", "participated_by_me"]
+        fields = [
+            "start_date",
+            "end_date",
+            "organized_by_me",
+            "participated_by_me",
+            "min_participants",
+            "max_participants",
+            "near",
+            "radius",
+        ]
 
     def filter_organized_by_me(self, queryset, name, value):
         user = self.request.user
@@ -28,8 +66,29 @@ class EventFilter(django_filters.FilterSet):
     def filter_participated_by_me(self, queryset, name, value):
         user = self.request.user
         if user.is_authenticated:
-            if value:
-                return queryset.filter(participants=user)
-            else:
-                return queryset.exclude(participants=user)
+            # A (NOT) EXISTS probe of the (user, event) unique index, planned as a semi/anti-join instead of a
+            # join that can duplicate rows or a NOT IN subquery. The through model serves archived events too.
+            registrations = queryset.model.participants.through.objects
+            registered = Exists(registrations.filter(event=OuterRef("pk"), user=user))
+            return queryset.filter(registered if value else ~registered)
         return queryset.none()
+
+    def filter_near(self, queryset, name, value):
+        radius = self.form.cleaned_data.get("radius")
+        radius = self.default_radius if radius is None else float(radius)
+        return filter_within(queryset, *value, radius)
+
+    def filter_radius(self, queryset, name, value):
+        # Applied by filter_near, a radius without a point filters nothing.
+        return queryset
+
+
+class OccurrenceFilter(EventFilter):
+    """``EventFilter`` for occurrences: the required dates bound the expansion window instead of the event date."""
+
+    start_date = django_filters.DateTimeFilter(method="filter_window", required=True)
+    end_date = django_filters.DateTimeFilter(method="filter_window", required=True)
+
+    def filter_window(self, queryset, name, value):
+        # Applied by events.recurrence.expand.
+        return queryset
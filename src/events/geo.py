@@ -0,0 +1,113 @@
+import math
+from functools import reduce
+from operator import or_
+
+from django.db import models
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9
+EARTH_RADIUS = 6371.0088
+
+
+def encode(latitude, longitude, precision=PRECISION):
+    """Return the geohash of a point: interleaved longitude/latitude bisection bits in base 32."""
+    intervals = [[-180.0, 180.0], [-90.0, 90.0]]
+    values = [longitude, latitude]
+    chars = []
+    for i in range(precision * 5):
+        interval, value = intervals[i % 2], values[i % 2]
+        middle = (interval[0] + interval[1]) / 2
+        bit = value >= middle
+        interval[not bit] = middle
+        if i % 5 == 0:
+            chars.append(0)
+        chars[-1] = chars[-1] << 1 | bit
+    return "".join(BASE32[char] for char in chars)
+
+
+def cell_size(precision):
+    """Return the height and width in degrees of the cells at ``precision``."""
+    bits = precision * 5
+    return 180 / 2 ** (bits // 2), 360 / 2 ** (bits - bits // 2)
+
+
+def extent(latitude, radius):
+    """
+    Return how many degrees of latitude and longitude the circle spans from its centre.
+
+    The longitude span is ``None`` when the circle covers a pole and so every longitude.
+    """
+    angle = radius / EARTH_RADIUS
+    lat_span = math.degrees(angle)
+    if abs(latitude) + lat_span >= 90:
+        return lat_span, None
+    return lat_span, math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(latitude))))
+
+
+def covering_cells(latitude, longitude, lat_span, lng_span):
+    """
+    Return the geohash prefixes of the cell holding the centre and its eight neighbours.
+
+    The precision is the finest whose cells are at least as large as the circle's spans, so the circle never
+    reaches beyond the neighbours. Empty when even the coarsest cells are too small.
+    """
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        if height >= lat_span and width >= lng_span:
+            break
+    else:
+        return []
+
+    cells = set()
+    for lat_step in (-height, 0, height):
+        for lng_step in (-width, 0, width):
+            lat = min(max(latitude + lat_step, -90), 90)
+            lng = (longitude + lng_step + 180) % 360 - 180
+            cells.add(encode(lat, lng, precision))
+    return sorted(cells)
+
+
+def distance_to(latitude, longitude):
+    """The great-circle distance in km from the point to the row's coordinates, by the haversine formula."""
+    lat, lng = math.radians(latitude), math.radians(longitude)
+    haversine = Power(Sin((Radians("latitude") - lat) / 2), 2) + math.cos(lat) * Cos(Radians("latitude")) * Power(
+        Sin((Radians("longitude") - lng) / 2), 2
+    )
+    # Rounding can push the haversine a hair above 1, outside the domain of asin.
+    return 2 * EARTH_RADIUS * ASin(Least(Sqrt(haversine), 1.0))
+
+
+def filter_within(queryset, latitude, longitude, radius):
+    """
+    Filter ``queryset`` to rows within ``radius`` km of the point, annotated with their ``distance``.
+
+    Candidates are narrowed by geohash prefix ranges on the indexed cell column and a latitude/longitude bounding
+    box, so the exact distance is only computed for rows in the few cells around the point.
+    """
+    lat_span, lng_span = extent(latitude, radius)
+    candidates = models.Q(latitude__range=(latitude - lat_span, latitude + lat_span))
+    if lng_span is not None:
+        # A box crossing the antimeridian would need two ranges; the cells still narrow it down.
+        if -180 <= longitude - lng_span and longitude + lng_span <= 180:
+            candidates &= models.Q(longitude__range=(longitude - lng_span, longitude + lng_span))
+        cells = covering_cells(latitude, longitude, lat_span, lng_span)
+        if cells:
+            candidates &= reduce(or_, (models.Q(geohash__startswith=cell) for cell in cells))
+    return queryset.filter(candidates).annotate(distance=distance_to(latitude, longitude)).filter(distance__lte=radius)
+
+
+class GeohashField(models.CharField):
+    """The geohash cell of the row's ``latitude``/``longitude``, recomputed whenever the row is saved."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("max_length", PRECISION)
+        kwargs.setdefault("null", True)
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        latitude, longitude = model_instance.latitude, model_instance.longitude
+        value = None if latitude is None or longitude is None else encode(latitude, longitude)
+        setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections, transaction
+from django.utils.module_loading import import_string
+
+from events.cache import GENERATION_KEY, event_version_key, get_versions
+from events.models import Event
+from events.serializers import EventSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    A subscriber's pending notification for one event.
+
+    Notifications only flag the event as changed, so any number of them arriving before the subscriber wakes up
+    collapse into a single read.
+    """
+
+    def __init__(self, broker, event_id):
+        self.broker = broker
+        self.event_id = event_id
+        self.loop = asyncio.get_running_loop()
+        self.changed = asyncio.Event()
+
+    def notify(self):
+        # Publishers run in request threads, the subscriber on the server's event loop.
+        try:
+            self.loop.call_soon_threadsafe(self.changed.set)
+        except RuntimeError:
+            # The loop was closed under a subscriber that never got to unsubscribe.
+            pass
+
+    async def wait(self, timeout):
+        """Wait up to ``timeout`` seconds for a notification and return whether one arrived."""
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout)
+        except TimeoutError:
+            return False
+        self.changed.clear()
+        return True
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """
+    Fans event change notifications out to the subscribers of this process.
+
+    Backends implement ``publish``. One spanning several processes sends the event id over its transport, e.g. a
+    Redis channel, and calls ``deliver`` with it in every process receiving it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def publish(self, event_id):
+        raise NotImplementedError
+
+    def subscribe(self, event_id):
+        subscription = Subscription(self, event_id)
+        with self.lock:
+            self.subscriptions[event_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.event_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.event_id, None)
+
+    def deliver(self, event_id):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(event_id, ()))
+        for subscription in subscriptions:
+            subscription.notify()
+
+
+class InProcessBroker(Broker):
+    """Delivers to the subscribers of the publishing process only, enough when one ASGI process serves the API."""
+
+    def publish(self, event_id):
+        self.deliver(event_id)
+
+
+class PostgresBroker(Broker):
+    """
+    Publishes with PostgreSQL ``NOTIFY``, reaching the subscribers of every process sharing the database.
+
+    Each process listens on a dedicated connection, outside Django's connection handling and pool, from a daemon
+    thread started by its first subscription. After a reconnect every subscriber is woken up once, so a change
+    notified while the listener was down is not missed.
+    """
+
+    channel = "events_live"
+
+    def __init__(self, alias=DEFAULT_DB_ALIAS):
+        super().__init__()
+        self.alias = alias
+        self.listener = None
+        self.ready = threading.Event()
+
+    def publish(self, event_id):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, str(event_id)])
+
+    def subscribe(self, event_id):
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target=self.listen, name="events-live-listener", daemon=True)
+                self.listener.start()
+        return super().subscribe(event_id)
+
+    def listen(self):
+        import psycopg
+
+        settings_dict = connections[self.alias].settings_dict
+        params = {
+            "dbname": settings_dict["NAME"],
+            "user": settings_dict["USER"],
+            "password": settings_dict["PASSWORD"],
+            "host": settings_dict["HOST"],
+            "port": settings_dict["PORT"] or None,
+        }
+        while True:
+            try:
+                with psycopg.connect(**params, autocommit=True) as connection:
+                    connection.execute(f"LISTEN {self.channel}")
+                    self.ready.set()
+                    with self.lock:
+                        event_ids = list(self.subscriptions)
+                    for event_id in event_ids:
+                        self.deliver(event_id)
+                    for notify in connection.notifies():
+                        self.deliver(int(notify.payload))
+            except psycopg.Error:
+                self.ready.clear()
+                logger.exception("Lost the event notification listener connection, reconnecting.")
+                time.sleep(1)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    # Like search, the default follows the database: NOTIFY on PostgreSQL, in-process elsewhere.
+    if settings.EVENT_STREAM_BROKER:
+        return import_string(settings.EVENT_STREAM_BROKER)()
+    if connections[DEFAULT_DB_ALIAS].vendor == "postgresql":
+        return PostgresBroker()
+    return InProcessBroker()
+
+
+def publish_event(event_id):
+    # Published after the commit, once invalidate_event bumped the version subscribers read the event under.
+    transaction.on_commit(lambda: get_broker().publish(event_id))
+
+
+def get_snapshot(event_id):
+    """
+    Return the serialized event, or an empty dict once it is gone.
+
+    Snapshots are cached under the event's version, which is bumped before subscribers are notified, so the burst of
+    subscribers waking up after a change costs one query between them.
+    """
+    versions = get_versions(GENERATION_KEY, event_version_key(event_id))
+    key = "events:live:%s:%s" % (event_id, ":".join(str(version) for version in versions))
+    snapshot = cache.get(key)
+    if snapshot is None:
+        # Read from the primary: a lagging replica would cache pre-change data under the new version.
+        event = Event.objects.select_related("organizer").defer("search_vector").filter(pk=event_id).first()
+        snapshot = dict(EventSerializer(event).data) if event is not None else {}
+        cache.set(key, snapshot, timeout=settings.EVENT_CACHE_TIMEOUT)
+    return snapshot
+
+
+@lru_cache(maxsize=None)
+def get_read_executor():
+    return ThreadPoolExecutor(max_workers=settings.EVENT_STREAM_READ_THREADS, thread_name_prefix="events-live-read")
+
+
+def read_snapshot_sync(event_id):
+    try:
+        return get_snapshot(event_id)
+    finally:
+        # These threads serve no request, so nothing else closes connections past their CONN_MAX_AGE.
+        close_old_connections()
+
+
+async def read_snapshot(event_id):
+    """
+    ``get_snapshot`` on a small shared pool.
+
+    A thread-sensitive call would run on the request's own executor thread, which lives as long as the request;
+    for a stream that is the whole connection, so every open stream would hold a thread.
+    """
+    return await sync_to_async(read_snapshot_sync, thread_sensitive=False, executor=get_read_executor())(event_id)
+
+
+def message(name, data):
+    return f"event: {name}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def stream(subscription, snapshot):
+    """
+    Yield Server-Sent Events for ``subscription``, starting with ``snapshot``.
+
+    After every update the stream pauses for ``EVENT_STREAM_INTERVAL`` seconds, so a burst of registrations reaches
+    clients as a few updates per second, each carrying the latest state. Idle streams send a comment every
+    ``EVENT_STREAM_KEEPALIVE`` seconds to keep proxies from closing them.
+    """
+    try:
+        yield f"retry: {settings.EVENT_STREAM_RETRY}\n" + message("update", snapshot)
+        while True:
+            if not await subscription.wait(settings.EVENT_STREAM_KEEPALIVE):
+                yield ": keepalive\n\n"
+                continue
+            latest = await read_snapshot(subscription.event_id)
+            if not latest:
+                yield message("delete", {"id": subscription.event_id})
+                return
+            if latest != snapshot:
+                snapshot = latest
+                yield message("update", snapshot)
+            await asyncio.sleep(settings.EVENT_STREAM_INTERVAL)
+    finally:
+        subscription.close()
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from events.archive import archive_events, archive_horizon
+from events.cache import invalidate_all
+
+
+class Command(BaseCommand):
+    help = "Move events older than EVENT_ARCHIVE_AFTER_DAYS, with their registrations, into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Events moved per transaction.")
+
+    def handle(self, *args, **options):
+        # The views read the archive by the same horizon, so the setting is the only knob.
+        before = archive_horizon()
+        batch_size = options["batch_size"]
+        archived = 0
+
+        while True:
+            moved = archive_events(before, batch_size)
+            archived += moved
+            if moved < batch_size:
+                break
+        if archived:
+            invalidate_all()
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} event(s)."))
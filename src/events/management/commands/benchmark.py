@@ -0,0 +1,92 @@
+import json
+import random
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from events.benchmark import SCENARIOS, Context, compare, measure, unthrottled
+from events.models import Event
+from events.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the event endpoints against a seeded test database, report latency percentiles, throughput "
+        "and query counts, and fail on regressions against a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5000, help="Users to seed.")
+        parser.add_argument("--events", type=int, default=20000, help="Events to seed.")
+        parser.add_argument("--registrations", type=int, default=100000, help="Registrations to seed.")
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario.")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(SCENARIOS),
+            help="Scenario to run, repeatable; all by default.",
+        )
+        parser.add_argument(
+            "--baseline",
+            default=settings.BASE_DIR.parent / "benchmarks" / "baseline.json",
+            type=Path,
+            help="Baseline JSON file to compare with.",
+        )
+        parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline.")
+        parser.add_argument(
+            "--threshold", type=float, default=0.25, help="Tolerated latency increase over the baseline, 0.25 = 25%%."
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the dataset and the requests.")
+        parser.add_argument("--keepdb", action="store_true", help="Keep and reuse the seeded test database.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        databases = setup_databases(self.verbosity(options), interactive=False, keepdb=options["keepdb"])
+        try:
+            results = self.run(options)
+        finally:
+            teardown_databases(databases, self.verbosity(options), keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        self.report(results)
+        baseline_path = options["baseline"]
+        if options["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}."))
+        elif baseline_path.exists():
+            regressions = compare(results, json.loads(baseline_path.read_text()), options["threshold"])
+            if regressions:
+                raise CommandError("Performance regressions:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+        else:
+            self.stdout.write(f"No baseline at {baseline_path}, run with --save-baseline to store one.")
+
+    @staticmethod
+    def verbosity(options):
+        return max(options["verbosity"] - 1, 0)
+
+    def run(self, options):
+        if not (options["keepdb"] and Event.objects.exists()):
+            self.stdout.write("Seeding the benchmark database...")
+            Seeder(seed=options["seed"]).seed(options["users"], options["events"], options["registrations"])
+
+        context = Context(random.Random(options["seed"]), options["requests"] + options["warmup"])
+        results = {}
+        with unthrottled():
+            for name in options["scenario"] or SCENARIOS:
+                self.stdout.write(f"Running {name}...")
+                results[name] = measure(SCENARIOS[name], context, options["requests"], options["warmup"])
+        return results
+
+    def report(self, results):
+        header = f"{'scenario':<20}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>9}{'errors':>8}"
+        self.stdout.write(header)
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<20}{result['p50']:>10.2f}{result['p95']:>10.2f}{result['p99']:>10.2f}"
+                f"{result['throughput']:>10.1f}{result['queries']:>9}{result['errors']:>8}"
+            )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from events.sync import prune_tombstones, tombstone_horizon
+
+
+class Command(BaseCommand):
+    help = "Delete the tombstones of events deleted more than EVENT_TOMBSTONE_RETENTION_DAYS ago."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Tombstones deleted per transaction.")
+
+    def handle(self, *args, **options):
+        # /api/events/changes/ rejects cursors by the same horizon, so the setting is the only knob.
+        before = tombstone_horizon()
+        batch_size = options["batch_size"]
+        pruned = 0
+
+        while True:
+            deleted = prune_tombstones(before, batch_size)
+            pruned += deleted
+            if deleted < batch_size:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} tombstone(s)."))
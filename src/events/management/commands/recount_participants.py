@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from events.cache import invalidate_all
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized participant_count and seats_left of events from their registrations."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000, help="Events updated per statement.")
+
+    def handle(self, *args, **options):
+        last_id = Event.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        batch_size = options["batch_size"]
+        updated = 0
+
+        # Id ranges keep every UPDATE short, so registrations are never blocked for long.
+        for start in range(0, last_id + 1, batch_size):
+            updated += Event.objects.filter(id__gte=start, id__lt=start + batch_size).recount_participants()
+        invalidate_all()
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted participants of {updated} event(s)."))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.cache import invalidate_all
+from events.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic users, events and registrations with realistic distributions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Users to create.")
+        parser.add_argument("--events", type=int, default=5000, help="Events to create.")
+        parser.add_argument("--registrations", type=int, default=20000, help="Approximate registrations to create.")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Rows per COPY or INSERT.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, the same seed generates the same data.")
+        parser.add_argument("--password", default="password", help="Password of every generated user.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        seeder = Seeder(seed=options["seed"], batch_size=options["batch_size"], password=options["password"])
+        users, events, registrations = seeder.seed(options["users"], options["events"], options["registrations"])
+        invalidate_all()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {users} user(s), {events} event(s) and {registrations} registration(s) "
+                f"in {time.perf_counter() - start:.1f}s."
+            )
+        )
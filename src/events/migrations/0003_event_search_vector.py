@@ -0,0 +1,80 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:37
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+CREATE_SEARCH_VECTOR = """
+CREATE FUNCTION events_event_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.location, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce((
+            SELECT concat_ws(' ', username, first_name, last_name)
+            FROM users_customusermodel WHERE id = NEW.organizer_id
+        ), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER events_event_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, location, organizer_id ON events_event
+    FOR EACH ROW EXECUTE FUNCTION events_event_search_vector_update();
+
+CREATE FUNCTION events_organizer_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    UPDATE events_event SET organizer_id = organizer_id WHERE organizer_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER events_organizer_search_vector_trigger
+    AFTER UPDATE OF username, first_name, last_name ON users_customusermodel
+    FOR EACH ROW
+    WHEN (
+        OLD.username IS DISTINCT FROM NEW.username
+        OR OLD.first_name IS DISTINCT FROM NEW.first_name
+        OR OLD.last_name IS DISTINCT FROM NEW.last_name
+    )
+    EXECUTE FUNCTION events_organizer_search_vector_update();
+
+UPDATE events_event SET organizer_id = organizer_id;
+
+CREATE INDEX event_search_vector_idx ON events_event USING gin (search_vector);
+"""
+
+DROP_SEARCH_VECTOR = """
+DROP INDEX IF EXISTS event_search_vector_idx;
+DROP TRIGGER IF EXISTS events_organizer_search_vector_trigger ON users_customusermodel;
+DROP FUNCTION IF EXISTS events_organizer_search_vector_update();
+DROP TRIGGER IF EXISTS events_event_search_vector_trigger ON events_event;
+DROP FUNCTION IF EXISTS events_event_search_vector_update();
+"""
+
+
+def create_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_SEARCH_VECTOR)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH_VECTOR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_date_id_idx'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector, drop_search_vector),
+    ]
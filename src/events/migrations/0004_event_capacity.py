@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='seats_left',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
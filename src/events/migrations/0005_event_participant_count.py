@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 04:43
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_participants(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    EventRegistration = apps.get_model("events", "EventRegistration")
+    registrations = (
+        EventRegistration.objects.filter(event=models.OuterRef("pk"))
+        .order_by()
+        .values("event")
+        .annotate(count=models.Count("pk"))
+        .values("count")
+    )
+    Event.objects.update(participant_count=Coalesce(models.Subquery(registrations), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_capacity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_participants, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-participant_count', 'id'], name='event_popularity_idx'),
+        ),
+    ]
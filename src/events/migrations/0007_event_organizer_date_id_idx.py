@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+import events.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('events', '0006_event_tombstone'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        events.operations.AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'date', 'id'], name='event_organizer_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:11
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX archived_event_search_vector_idx ON events_archivedevent USING gin (search_vector)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS archived_event_search_vector_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_organizer_date_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('date', models.DateTimeField()),
+                ('location', models.CharField(max_length=255)),
+                ('capacity', models.PositiveIntegerField(blank=True, null=True)),
+                ('seats_left', models.PositiveIntegerField(blank=True, null=True)),
+                ('participant_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('organizer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_organized_events', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedEventRegistration',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='events.archivedevent')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'event')},
+            },
+        ),
+        migrations.AddField(
+            model_name='archivedevent',
+            name='participants',
+            field=models.ManyToManyField(related_name='archived_events_participated', through='events.ArchivedEventRegistration', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedevent',
+            index=models.Index(fields=['date', 'id'], name='archived_event_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedevent',
+            index=models.Index(fields=['organizer', 'date', 'id'], name='archived_event_org_date_id_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
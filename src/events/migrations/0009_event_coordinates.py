@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:15
+
+import django.core.validators
+from django.conf import settings
+from django.db import migrations, models
+
+import events.geo
+import events.operations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('events', '0008_archived_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedevent',
+            name='geohash',
+            field=events.geo.GeohashField(editable=False, max_length=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedevent',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedevent',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='geohash',
+            field=events.geo.GeohashField(editable=False, max_length=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='archivedevent',
+            index=models.Index(fields=['geohash'], name='archived_event_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        events.operations.AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(fields=['geohash'], name='event_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.4 on 2026-10-18 05:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+import events.operations
+import events.recurrence
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('events', '0009_event_coordinates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedevent',
+            name='recurrence',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='archivedevent',
+            name='recurrence_end',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedeventregistration',
+            name='occurrence',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence',
+            field=models.CharField(blank=True, default='', max_length=255, validators=[events.recurrence.validate_recurrence]),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_end',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='eventregistration',
+            name='occurrence',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        events.operations.AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(condition=models.Q(('recurrence', ''), _negated=True), fields=['date', 'id'], name='event_series_date_id_idx'),
+        ),
+        events.operations.AddUniqueConstraintConcurrently(
+            model_name='archivedeventregistration',
+            constraint=models.UniqueConstraint(fields=('user', 'event', 'occurrence'), name='archived_registration_uniq'),
+        ),
+        events.operations.AddUniqueConstraintConcurrently(
+            model_name='archivedeventregistration',
+            constraint=models.UniqueConstraint(condition=models.Q(('occurrence__isnull', True)), fields=('user', 'event'), name='archived_registration_single_uniq'),
+        ),
+        events.operations.AddUniqueConstraintConcurrently(
+            model_name='eventregistration',
+            constraint=models.UniqueConstraint(fields=('user', 'event', 'occurrence'), name='registration_user_event_uniq'),
+        ),
+        events.operations.AddUniqueConstraintConcurrently(
+            model_name='eventregistration',
+            constraint=models.UniqueConstraint(condition=models.Q(('occurrence__isnull', True)), fields=('user', 'event'), name='registration_user_single_event_uniq'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='archivedeventregistration',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='eventregistration',
+            unique_together=set(),
+        ),
+    ]
@@ -1,9 +1,58 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import connections, models, router, transaction
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from events.geo import GeohashField
+from events.recurrence import parse_rule, validate_recurrence
 
 User = get_user_model()
 
 
+class EventQuerySet(models.QuerySet):
+
+    def add_participant(self, event_id):
+        """
+        Count a new participant and take a seat with a conditional ``UPDATE ... WHERE seats_left > 0``.
+
+        Unlimited events always succeed. The row lock is held only from this statement to the commit, so callers
+        should issue it last.
+        """
+        seats = models.Q(seats_left__isnull=True) | models.Q(seats_left__gt=0)
+        updated = self.filter(seats, pk=event_id).update(
+            participant_count=models.F("participant_count") + 1,
+            seats_left=models.F("seats_left") - 1,
+            updated_at=timezone.now(),
+        )
+        return updated > 0
+
+    def remove_participant(self, event_id):
+        return self.filter(pk=event_id).update(
+            participant_count=Greatest(models.F("participant_count") - 1, 0),
+            seats_left=models.F("seats_left") + 1,
+            updated_at=timezone.now(),
+        )
+
+    def recount_participants(self):
+        """Recompute ``participant_count`` and ``seats_left`` from the registrations in a single UPDATE."""
+        registrations = (
+            EventRegistration.objects.filter(event=models.OuterRef("pk"))
+            .order_by()
+            .values("event")
+            .annotate(count=models.Count("pk"))
+            .values("count")
+        )
+        count = Coalesce(models.Subquery(registrations), 0)
+        # Recurring events have a capacity per occurrence and no series-wide seat count.
+        seats_left = models.Case(
+            models.When(capacity__isnull=False, recurrence="", then=Greatest(models.F("capacity") - count, 0))
+        )
+        return self.update(participant_count=count, seats_left=seats_left)
+
+
 class Event(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
@@ -12,21 +61,198 @@ class Event(models.Model):
     organizer = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="organized_events", blank=True, null=True
     )
+    latitude = models.FloatField(blank=True, null=True, validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(blank=True, null=True, validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    geohash = GeohashField()
+    # An RRULE subset, see events.recurrence; blank for one-off events.
+    recurrence = models.CharField(max_length=255, blank=True, default="", validators=[validate_recurrence])
+    # The last occurrence of a bounded series, so window queries can skip finished series.
+    recurrence_end = models.DateTimeField(blank=True, null=True, editable=False)
     participants = models.ManyToManyField(User, through="EventRegistration", related_name="events_participated")
+    capacity = models.PositiveIntegerField(blank=True, null=True)
+    seats_left = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    participant_count = models.PositiveIntegerField(default=0, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained by a database trigger on PostgreSQL, see migration 0003.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = EventQuerySet.as_manager()
+
+    # Columns written with atomic UPDATEs or by the database, never from a possibly stale instance.
+    db_maintained_fields = ("seats_left", "participant_count", "search_vector")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "id"], name="event_date_id_idx"),
+            models.Index(fields=["organizer", "date", "id"], name="event_organizer_date_id_idx"),
+            models.Index(fields=["-participant_count", "id"], name="event_popularity_idx"),
+            models.Index(fields=["updated_at", "id"], name="event_updated_at_id_idx"),
+            # The pattern opclass lets PostgreSQL answer the ``near`` filter's geohash prefix LIKEs from the index.
+            models.Index(fields=["geohash"], name="event_geohash_idx", opclasses=["varchar_pattern_ops"]),
+            models.Index(fields=["date", "id"], name="event_series_date_id_idx", condition=~models.Q(recurrence="")),
+        ]
+
     def __str__(self):
         return f"{self.title} @ {self.date}"
 
+    def save(self, *args, **kwargs):
+        self.recurrence_end = parse_rule(self.recurrence).last(self.date) if self.recurrence else None
+        if self._state.adding and self.seats_left is None and self.capacity is not None and not self.recurrence:
+            # Every seat of a new one-off event is free; recurring events count seats per occurrence instead.
+            self.seats_left = max(self.capacity - self.participant_count, 0)
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            skipped = set(self.db_maintained_fields) | self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields if not field.primary_key and field.name not in skipped
+            ]
+        super().save(*args, **kwargs)
+
+
+class EventRegistrationQuerySet(models.QuerySet):
+
+    def register(self, user, event_id):
+        """
+        Register ``user`` for the event in a single conflict-aware INSERT.
+
+        Returns ``(registration_id, event_title)``, or ``None`` when the event does not exist, recurs, is organized
+        by ``user``, is fully booked or already has the registration, so callers only pay for a diagnosis query on the
+        failure path. The seat itself is taken separately with ``Event.objects.add_participant``.
+        """
+        db = router.db_for_write(self.model)
+        quote = connections[db].ops.quote_name
+        registration, event = quote(self.model._meta.db_table), quote(Event._meta.db_table)
+        sql = (
+            f"INSERT INTO {registration} ({quote('user_id')}, {quote('event_id')}) "
+            f"SELECT %s, {quote('id')} FROM {event} "
+            f"WHERE {quote('id')} = %s AND ({quote('organizer_id')} IS NULL OR {quote('organizer_id')} <> %s) "
+            f"AND ({quote('seats_left')} IS NULL OR {quote('seats_left')} > 0) "
+            f"AND {quote('recurrence')} = '' "
+            f"ON CONFLICT DO NOTHING "
+            f"RETURNING {quote('id')}, "
+            f"(SELECT {quote('title')} FROM {event} WHERE {event}.{quote('id')} = {registration}.{quote('event_id')})"
+        )
+        with connections[db].cursor() as cursor:
+            cursor.execute(sql, [user.pk, event_id, user.pk])
+            return cursor.fetchone()
+
 
 class EventRegistration(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
+    # The occurrence of a recurring event the user attends, null for one-off events.
+    occurrence = models.DateTimeField(blank=True, null=True)
+
+    objects = EventRegistrationQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # Also serves (user, event) lookups through its prefix.
+            models.UniqueConstraint(fields=["user", "event", "occurrence"], name="registration_user_event_uniq"),
+            models.UniqueConstraint(
+                fields=["user", "event"],
+                condition=models.Q(occurrence__isnull=True),
+                name="registration_user_single_event_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} registered for {self.event}"
+
+    def clean(self):
+        # Lets the admin report a full event on the form; save() still enforces it atomically.
+        if self._state.adding and Event.objects.filter(pk=self.event_id, seats_left=0).exists():
+            raise ValidationError({"event": "This event is fully booked."})
+
+    def save(self, *args, **kwargs):
+        # The post_save signal takes the seat and raises when none is left, which must undo the INSERT too.
+        with transaction.atomic(using=kwargs.get("using") or router.db_for_write(type(self), instance=self)):
+            super().save(*args, **kwargs)
+
+
+class CalendarFeed(models.Model):
+    """The secret token in the URLs of a user's iCalendar feeds, see ``events.feeds``."""
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="calendar_feed")
+    token = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Calendar feed of {self.user}"
+
+
+class EventTombstone(models.Model):
+    """Marks a deleted event for clients syncing the catalogue through ``/api/events/changes/``."""
+
+    event_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Event {self.event_id} deleted at {self.deleted_at}"
+
+
+class ArchivedEvent(models.Model):
+    """
+    An event moved out of ``Event`` by the ``archive_events`` command once it is older than the archive horizon.
+
+    The row keeps its id and every column of the hot table, so the API serves it unchanged.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    date = models.DateTimeField()
+    location = models.CharField(max_length=255)
+    organizer = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_organized_events", blank=True, null=True
+    )
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    geohash = GeohashField()
+    recurrence = models.CharField(max_length=255, blank=True, default="")
+    recurrence_end = models.DateTimeField(blank=True, null=True)
+    participants = models.ManyToManyField(
+        User, through="ArchivedEventRegistration", related_name="archived_events_participated"
+    )
+    capacity = models.PositiveIntegerField(blank=True, null=True)
+    seats_left = models.PositiveIntegerField(blank=True, null=True)
+    participant_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    # Copied from the hot table; see migration 0008 for its index.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "id"], name="archived_event_date_id_idx"),
+            models.Index(fields=["organizer", "date", "id"], name="archived_event_org_date_id_idx"),
+            models.Index(fields=["geohash"], name="archived_event_geohash_idx", opclasses=["varchar_pattern_ops"]),
+        ]
+
+    def __str__(self):
+        return f"{self.title} @ {self.date} (archived)"
+
+
+class ArchivedEventRegistration(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE)
+    occurrence = models.DateTimeField(blank=True, null=True)
 
     class Meta:
-        unique_together = ("user", "event")
+        constraints = [
+            models.UniqueConstraint(fields=["user", "event", "occurrence"], name="archived_registration_uniq"),
+            models.UniqueConstraint(
+                fields=["user", "event"],
+                condition=models.Q(occurrence__isnull=True),
+                name="archived_registration_single_uniq",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user} registered for {self.event}"
@@ -0,0 +1,59 @@
+from django.contrib.postgres.operations import AddIndexConcurrently as PostgresAddIndexConcurrently
+from django.db.migrations.operations import AddConstraint, AddIndex
+
+
+class AddIndexConcurrently(PostgresAddIndexConcurrently):
+    """
+    ``CREATE INDEX CONCURRENTLY`` on PostgreSQL, so building an index on a live table never blocks writes.
+
+    Other databases fall back to a plain ``AddIndex``. Migrations using it must set ``atomic = False``.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class AddUniqueConstraintConcurrently(AddConstraint):
+    """
+    Adds a ``UniqueConstraint`` on PostgreSQL without blocking writes while its index is built.
+
+    The unique index is created with ``CREATE UNIQUE INDEX CONCURRENTLY``. A constraint without a condition is then
+    attached to it with ``ADD CONSTRAINT ... USING INDEX``, which only holds the table lock for a catalog update;
+    a conditional one is just the partial index, as Django makes it. Other databases fall back to a plain
+    ``AddConstraint``. Migrations using it must set ``atomic = False``.
+    """
+
+    sql_create_unique_index = (
+        "CREATE UNIQUE INDEX CONCURRENTLY %(name)s ON %(table)s%(using)s (%(columns)s)%(include)s%(condition)s"
+    )
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        constraint = self.constraint
+        schema_editor.execute(
+            schema_editor._create_index_sql(
+                model,
+                fields=[model._meta.get_field(name) for name in constraint.fields],
+                name=constraint.name,
+                sql=self.sql_create_unique_index,
+                condition=constraint._get_condition_sql(model, schema_editor),
+            )
+        )
+        if constraint.condition is None:
+            quote = schema_editor.quote_name
+            table, name = quote(model._meta.db_table), quote(constraint.name)
+            schema_editor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
@@ -0,0 +1,180 @@
+import base64
+import binascii
+import datetime
+import decimal
+import heapq
+import itertools
+import json
+from functools import cmp_to_key, partial
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination keyed on the full ordering tuple of the queryset.
+
+    Unlike DRF's ``CursorPagination`` the cursor stores the value of every ordering field of the
+    boundary row (``id`` is always appended as a tie-breaker), so the next page is fetched with a
+    ``WHERE (date, id) > (...)`` range condition and never needs an OFFSET, however deep the client goes.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("date", "id")
+
+    def get_ordering(self, request, queryset, view):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)] or list(self.ordering)
+        ordering = ["%sid" % field[:-2] if field.lstrip("-") == "pk" else field for field in ordering]
+        if not any(field.lstrip("-") == "id" for field in ordering):
+            ordering.append("id")
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.build_page(list(queryset))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the sliced queryset for the requested page, without evaluating it."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(self.cursor.position, reverse))
+
+        ordering = [self.invert(field) for field in self.ordering] if reverse else self.ordering
+        return queryset.order_by(*ordering)[: self.page_size + 1]
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """Paginate the union of querysets sharing one ordering, e.g. hot and archived events, as a single keyset."""
+        pages = [self.get_page_queryset(queryset, request, view) for queryset in querysets]
+        if pages[0] is None:
+            return None
+        return self.merge_pages(pages)
+
+    def merge_pages(self, pages):
+        """
+        Merge the rows fetched from the same cursor position out of several querysets into one page.
+
+        Every queryset is already sorted and over-fetched by one row, so the first ``page_size + 1`` merged rows are
+        exactly the rows a single table holding all of them would have returned.
+        """
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = [self.invert(field) for field in self.ordering] if reverse else self.ordering
+        rows = heapq.merge(*pages, key=cmp_to_key(partial(self.compare, ordering)))
+        return self.build_page(list(itertools.islice(rows, self.page_size + 1)))
+
+    @staticmethod
+    def compare(ordering, first, second):
+        for field in ordering:
+            name = field.lstrip("-")
+            a, b = getattr(first, name), getattr(second, name)
+            if a != b:
+                return (-1 if a < b else 1) * (-1 if field.startswith("-") else 1)
+        return 0
+
+    def build_page(self, results):
+        """Trim the over-fetched row and compute the neighbouring cursors."""
+        has_more = len(results) > self.page_size
+        self.page = list(results[: self.page_size])
+
+        if self.cursor is not None and self.cursor.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_keyset_filter(self, position, reverse):
+        keyset = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "gt" if field.startswith("-") == reverse else "lt"
+            keyset |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        # A redundant bound on the leading column lets the planner turn the OR chain into an index range scan.
+        leading = self.ordering[0]
+        lookup = "gte" if leading.startswith("-") == reverse else "lte"
+        return Q(**{f"{leading.lstrip('-')}__{lookup}": position[0]}) & keyset
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def get_position_from_instance(self, instance):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            position.append(encode_value(value))
+        return position
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            position, reverse = tokens["p"], bool(tokens.get("r"))
+            if tokens["o"] != list(self.ordering) or len(position) != len(self.ordering):
+                raise ValueError
+            position = [self.to_python(field.lstrip("-"), value) for field, value in zip(self.ordering, position)]
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def to_python(self, name, value):
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def encode_cursor(self, cursor):
+        tokens = {"p": cursor.position, "o": list(self.ordering)}
+        if cursor.reverse:
+            tokens["r"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(tokens, separators=(",", ":")).encode()).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.get_position_from_instance(self.page[-1]) if self.page else self.current_position()
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.get_position_from_instance(self.page[0]) if self.page else self.current_position()
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def current_position(self):
+        return [encode_value(value) for value in self.cursor.position]
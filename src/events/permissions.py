@@ -8,10 +8,10 @@ class IsOrganizerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        return obj.organizer == request.user
+        return obj.organizer_id == request.user.pk
 
 
-class IsNotOrganizer(permissions.BasePermission):
+class IsOrganizer(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        return obj.organizer != request.user
+        return obj.organizer_id == request.user.pk
@@ -0,0 +1,233 @@
+import calendar
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from functools import lru_cache
+from operator import itemgetter
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+MAX_COUNT = 1000
+
+
+class Rule:
+    """
+    A subset of the iCalendar RRULE: ``FREQ`` (DAILY, WEEKLY or MONTHLY), ``INTERVAL``, ``BYDAY`` for weekly rules
+    and at most one of ``COUNT`` and ``UNTIL``, e.g. ``FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=10``.
+
+    Occurrences keep the wall-clock time of the first one in ``TIME_ZONE``, and expanding from any point of a
+    series costs the same as expanding from its start.
+    """
+
+    def __init__(self, frequency, interval=1, weekdays=(), count=None, until=None):
+        self.frequency = frequency
+        self.interval = interval
+        self.weekdays = tuple(sorted(weekdays))
+        self.count = count
+        self.until = until
+
+    @classmethod
+    def parse(cls, value):
+        """Parse an RRULE string, raising ``ValueError`` with a readable message when it is not supported."""
+        parts = {}
+        for part in value.strip().upper().removeprefix("RRULE:").split(";"):
+            name, _, argument = part.partition("=")
+            if not argument or name in parts:
+                raise ValueError(f"Invalid rule part {part!r}.")
+            parts[name] = argument
+
+        unknown = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "COUNT", "UNTIL"}
+        if unknown:
+            raise ValueError(f"Unsupported rule part {sorted(unknown)[0]}.")
+        if parts.get("FREQ") not in FREQUENCIES:
+            raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}.")
+        if "COUNT" in parts and "UNTIL" in parts:
+            raise ValueError("COUNT and UNTIL cannot be combined.")
+        if "BYDAY" in parts and parts["FREQ"] != "WEEKLY":
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY.")
+
+        try:
+            interval = int(parts.get("INTERVAL", 1))
+            count = int(parts["COUNT"]) if "COUNT" in parts else None
+        except ValueError:
+            raise ValueError("INTERVAL and COUNT must be integers.")
+        if not 1 <= interval <= 1000:
+            raise ValueError("INTERVAL must be between 1 and 1000.")
+        if count is not None and not 1 <= count <= MAX_COUNT:
+            raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}.")
+
+        weekdays = set()
+        for day in parts["BYDAY"].split(",") if "BYDAY" in parts else ():
+            if day not in WEEKDAYS:
+                raise ValueError(f"Invalid BYDAY value {day!r}.")
+            weekdays.add(WEEKDAYS.index(day))
+
+        until = None
+        if "UNTIL" in parts:
+            for format in ("%Y%m%dT%H%M%SZ", "%Y%m%d"):
+                try:
+                    until = datetime.strptime(parts["UNTIL"], format).replace(tzinfo=dt_timezone.utc)
+                    break
+                except ValueError:
+                    continue
+            else:
+                raise ValueError("UNTIL must be a UTC date or date-time, e.g. 20271231T235959Z.")
+
+        return cls(parts["FREQ"], interval, weekdays, count, until)
+
+    def __str__(self):
+        parts = [f"FREQ={self.frequency}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.weekdays:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.weekdays))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until:%Y%m%dT%H%M%SZ}")
+        return ";".join(parts)
+
+    def occurrences(self, dtstart, start=None, end=None, last=None):
+        """
+        Yield the occurrences of a series first held at ``dtstart`` between ``start`` and ``end``, both included.
+
+        The walk jumps straight to the period containing ``start`` instead of stepping from ``dtstart``. ``COUNT``
+        is only known by position, so counted series are walked from their start unless their ``last`` occurrence
+        is passed in to bound them instead. Without an ``end`` the rule must be bounded by ``COUNT`` or ``UNTIL``.
+        """
+        tz = timezone.get_default_timezone()
+        first = timezone.localtime(dtstart, tz).replace(tzinfo=None)
+        counted = self.count is not None and last is None
+        begin = first
+        if start is not None and start > dtstart and not counted:
+            begin = timezone.localtime(start, tz).replace(tzinfo=None)
+
+        wall_times = self.wall_times(first, begin)
+        if counted:
+            wall_times = itertools.islice(wall_times, self.count)
+        for wall_time in wall_times:
+            value = timezone.make_aware(wall_time, tz)
+            if any(bound is not None and value > bound for bound in (end, self.until, last)):
+                return
+            if start is None or value >= start:
+                yield value
+
+    def wall_times(self, first, begin):
+        try:
+            yield from self.steps(first, begin)
+        except OverflowError:
+            # The series outlasts the calendar, e.g. UNTIL=99991231; there is nothing left to yield.
+            return
+
+    def steps(self, first, begin):
+        if self.frequency == "DAILY":
+            step = timedelta(days=self.interval)
+            # Ceiling division: the first step at or after begin.
+            index = -((first - begin) // step)
+            for index in itertools.count(index):
+                yield first + index * step
+
+        elif self.frequency == "WEEKLY":
+            days = self.weekdays or (first.weekday(),)
+            week = first - timedelta(days=first.weekday())
+            step = timedelta(weeks=self.interval)
+            for index in itertools.count((begin - week) // step):
+                for day in days:
+                    value = week + index * step + timedelta(days=day)
+                    if value >= first:
+                        yield value
+
+        else:
+            months = (begin.year - first.year) * 12 + begin.month - first.month
+            for index in itertools.count(months // self.interval):
+                month = first.month - 1 + index * self.interval
+                year, month = first.year + month // 12, month % 12 + 1
+                if year > datetime.max.year:
+                    raise OverflowError
+                # Like RRULE, months without the day of the first occurrence are skipped.
+                if first.day <= calendar.monthrange(year, month)[1]:
+                    yield first.replace(year=year, month=month)
+
+    def last(self, dtstart):
+        """
+        Return the last occurrence, or ``None`` when the series never ends.
+
+        Counted series are walked, at most ``MAX_COUNT`` steps. ``UNTIL`` puts no limit on the length of a series, so
+        those are searched backwards from ``UNTIL`` in windows doubling from one period, each expanded like a page.
+        """
+        if self.count is None and self.until is None:
+            return None
+        last = None
+        if self.until is None:
+            for last in self.occurrences(dtstart):
+                pass
+            return last
+
+        # Months lacking the day of the first occurrence are skipped, so a monthly window may hold none.
+        window = {"DAILY": timedelta(days=1), "WEEKLY": timedelta(weeks=1), "MONTHLY": timedelta(days=31)}
+        window = window[self.frequency] * self.interval
+        while True:
+            start = self.until - window
+            for last in self.occurrences(dtstart, start, self.until):
+                pass
+            if last is not None or start <= dtstart:
+                return last
+            window *= 2
+
+    def includes(self, dtstart, value, last=None):
+        return next(self.occurrences(dtstart, value, value, last), None) == value
+
+
+@lru_cache(maxsize=1024)
+def parse_rule(value):
+    return Rule.parse(value)
+
+
+def validate_recurrence(value):
+    if value:
+        try:
+            parse_rule(value)
+        except ValueError as exc:
+            raise ValidationError(str(exc))
+
+
+def series_stream(event, start, end):
+    for value in parse_rule(event.recurrence).occurrences(event.date, start, end, event.recurrence_end):
+        yield (value, event.id), event
+
+
+def expand(queryset, start, end, after=None, limit=None):
+    """
+    Return ``(occurrence, event)`` pairs of the events in ``queryset`` held between ``start`` and ``end``.
+
+    Pairs are ordered by occurrence then event id and resume after the ``after`` pair. One-off events are read with a
+    keyset range scan and only series overlapping the window are loaded; every series then yields its occurrences
+    lazily into a heap merge, so a page costs one expansion step per series plus one per returned occurrence.
+    """
+    if after is not None:
+        start = max(start, after[0])
+
+    singles = queryset.filter(recurrence="", date__gte=start, date__lte=end)
+    if after is not None:
+        singles = singles.filter(Q(date__gt=after[0]) | Q(date=after[0], id__gt=after[1]))
+    singles = singles.order_by("date", "id")
+    if limit is not None:
+        singles = singles[:limit]
+
+    series = (
+        queryset.exclude(recurrence="")
+        .filter(date__lte=end)
+        .filter(Q(recurrence_end__isnull=True) | Q(recurrence_end__gte=start))
+    )
+
+    streams = [[((event.date, event.id), event) for event in singles]]
+    streams += [series_stream(event, start, end) for event in series]
+    pairs = heapq.merge(*streams, key=itemgetter(0))
+    if after is not None:
+        pairs = itertools.dropwhile(lambda pair: pair[0] <= after, pairs)
+    return [(key[0], event) for key, event in itertools.islice(pairs, limit)]
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.utils.module_loading import import_string
+from rest_framework import filters
+
+
+class PostgresSearchFilter(filters.SearchFilter):
+    """Full-text search over the trigger-maintained ``search_vector`` column, ranked by relevance."""
+
+    search_config = "english"
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        query = SearchQuery(" ".join(terms), config=self.search_config, search_type="websearch")
+        # ts_rank returns a real; casting keeps the value exact through the pagination cursor.
+        rank = Cast(SearchRank(F("search_vector"), query), FloatField())
+        return queryset.filter(search_vector=query).annotate(rank=rank).order_by("-rank", "date", "id")
+
+
+class EventSearchFilter(filters.SearchFilter):
+    """
+    Delegates ``?search=`` to the backend named by ``EVENT_SEARCH_BACKEND``.
+
+    Without the setting, PostgreSQL databases use full-text search and every other database falls back to
+    ``SearchFilter``'s substring matching over ``search_fields``.
+    """
+
+    def get_backend(self, queryset):
+        if getattr(settings, "EVENT_SEARCH_BACKEND", None):
+            return import_string(settings.EVENT_SEARCH_BACKEND)()
+        if connections[queryset.db].vendor == "postgresql":
+            return PostgresSearchFilter()
+        return filters.SearchFilter()
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.get_search_terms(request):
+            return queryset
+        return self.get_backend(queryset).filter_queryset(request, queryset, view)
@@ -0,0 +1,172 @@
+import csv
+import io
+import itertools
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+from events.models import Event, EventRegistration
+
+User = get_user_model()
+
+LOCATIONS = {
+    "Riga": (56.95, 24.11),
+    "Berlin": (52.52, 13.40),
+    "Lisbon": (38.72, -9.14),
+    "Warsaw": (52.23, 21.01),
+    "Vilnius": (54.69, 25.28),
+    "Tallinn": (59.44, 24.75),
+    "Prague": (50.08, 14.44),
+    "Vienna": (48.21, 16.37),
+    "Madrid": (40.42, -3.70),
+    "Oslo": (59.91, 10.75),
+}
+WORDS = ["music", "tech", "expo", "meetup", "python", "summit", "art", "festival", "workshop", "conference"]
+CAPACITIES = [None, None, None, 20, 50, 100, 500]
+
+
+class Seeder:
+    """
+    Generates users, events and registrations with a deterministic random source.
+
+    Rows go in with ``COPY`` on PostgreSQL and batched ``bulk_create`` elsewhere, and every user shares one
+    precomputed password hash, so loading millions of rows takes minutes. Organizers and event popularity follow
+    a Zipf-like skew, about a third of the events lie in the past and registrations respect capacities.
+    """
+
+    def __init__(self, seed=0, batch_size=10000, password="password", skew=1.1):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.password = make_password(password)
+        self.skew = skew
+        self.now = timezone.now()
+
+    def seed(self, users, events, registrations):
+        """Create the rows and return how many users, events and registrations were created."""
+        user_ids = self.create_users(users)
+        events = self.create_events(events, user_ids)
+        registrations = self.create_registrations(registrations, user_ids, events)
+        return len(user_ids), len(events), registrations
+
+    def zipf_weights(self, count):
+        # Randomly ranked, so the popular rows are spread over the id range instead of clustered at its start.
+        ranks = list(range(1, count + 1))
+        self.rng.shuffle(ranks)
+        return list(itertools.accumulate(1 / rank**self.skew for rank in ranks))
+
+    def create_users(self, count):
+        start = (User.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+        rows = (
+            User(
+                password=self.password,
+                username=f"seed{start + i}",
+                first_name=self.rng.choice(["Anna", "Janis", "Maria", "Peter", "Laura", "Tom"]),
+                last_name=self.rng.choice(["Ozols", "Smith", "Berzina", "Novak", "Silva", "Meyer"]),
+                email=f"seed{start + i}@example.com",
+            )
+            for i in range(count)
+        )
+        self.insert(User, rows)
+        return list(User.objects.filter(id__gte=start).order_by("id").values_list("id", flat=True))
+
+    def create_events(self, count, user_ids):
+        if not user_ids:
+            return []
+        start = (Event.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+        organizers = self.zipf_weights(len(user_ids))
+
+        def rows():
+            for i in range(count):
+                capacity = self.rng.choice(CAPACITIES)
+                # About a third of the events already took place, the rest are spread over the next year.
+                days = self.rng.uniform(-180, 0) if self.rng.random() < 0.33 else self.rng.uniform(0, 365)
+                location = self.rng.choice(list(LOCATIONS))
+                # Venues spread over about 20 km around the city centre.
+                latitude, longitude = (coordinate + self.rng.uniform(-0.1, 0.1) for coordinate in LOCATIONS[location])
+                yield Event(
+                    title=f"{self.rng.choice(WORDS).title()} {self.rng.choice(WORDS)} {start + i}",
+                    description=" ".join(self.rng.choices(WORDS, k=self.rng.randint(5, 30))),
+                    date=self.now + timedelta(days=days),
+                    location=location,
+                    latitude=latitude,
+                    longitude=longitude,
+                    organizer_id=self.rng.choices(user_ids, cum_weights=organizers)[0],
+                    capacity=capacity,
+                    seats_left=capacity,
+                    participant_count=0,
+                )
+
+        self.insert(Event, rows())
+        return list(Event.objects.filter(id__gte=start).order_by("id").values_list("id", "organizer_id", "capacity"))
+
+    def create_registrations(self, count, user_ids, events):
+        if not user_ids or not events or not count:
+            return 0
+        popularity = self.zipf_weights(len(events))
+        seats = {event_id: capacity for event_id, _, capacity in events if capacity is not None}
+
+        # Exponentially distributed per-user totals: most users attend a few events, some attend many.
+        activity = [self.rng.expovariate(1) for _ in user_ids]
+        scale = count / sum(activity)
+        wanted = [min(round(weight * scale), len(events)) for weight in activity]
+
+        def rows():
+            for user_id, total in zip(user_ids, wanted):
+                # Users are seeded once, so deduplicating per user is enough to never repeat a pair.
+                picked = set()
+                for _attempt in range(3):
+                    missing = total - len(picked)
+                    if not missing:
+                        break
+                    for event_id, organizer_id, _ in self.rng.choices(events, cum_weights=popularity, k=missing * 2):
+                        if len(picked) == total:
+                            break
+                        if event_id in picked or organizer_id == user_id or seats.get(event_id, 1) == 0:
+                            continue
+                        if event_id in seats:
+                            seats[event_id] -= 1
+                        picked.add(event_id)
+                        yield EventRegistration(user_id=user_id, event_id=event_id)
+
+        created = self.insert(EventRegistration, rows())
+        for start in range(events[0][0], events[-1][0] + 1, self.batch_size):
+            Event.objects.filter(id__gte=start, id__lt=start + self.batch_size).recount_participants()
+        return created
+
+    def insert(self, model, rows):
+        created = 0
+        for batch in iter(lambda: list(itertools.islice(rows, self.batch_size)), []):
+            if connection.vendor == "postgresql":
+                self.copy(model, batch)
+            else:
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+            created += len(batch)
+        return created
+
+    def copy(self, model, batch):
+        # Every column is sent, Python-side defaults have no database counterpart. pre_save fills in auto_now
+        # columns the way bulk_create does.
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in batch:
+            values = (field.get_db_prep_save(field.pre_save(obj, add=True), connection) for field in fields)
+            writer.writerow(r"\N" if value is None else value for value in values)
+        buffer.seek(0)
+
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+        sql = rf"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\N')"
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, "copy"):
+                # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+            else:
+                raw.copy_expert(sql, buffer)
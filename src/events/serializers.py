@@ -1,7 +1,8 @@
+from django.db import transaction
+from django.db.models import Count
 from rest_framework import serializers
-from rest_framework.validators import UniqueTogetherValidator
 
-from events.models import Event, EventRegistration
+from events.models import Event
 
 
 class EventSerializer(serializers.ModelSerializer):
@@ -15,31 +16,66 @@ class EventSerializer(serializers.ModelSerializer):
             "description",
             "date",
             "location",
+            "latitude",
+            "longitude",
+            "recurrence",
+            "recurrence_end",
             "organizer",
+            "capacity",
+            "seats_left",
+            "participant_count",
         ]
 
+    def validate(self, attrs):
+        coordinates = [attrs.get(field, getattr(self.instance, field, None)) for field in ("latitude", "longitude")]
+        if coordinates.count(None) == 1:
+            raise serializers.ValidationError("Latitude and longitude must be set together.")
 
-class CurrentEventDefault:
-    requires_context = True
+        if self.instance is not None:
+            # Registrations point at occurrences, which a new schedule would move or drop.
+            rescheduled = attrs.get("recurrence", self.instance.recurrence) != self.instance.recurrence or (
+                self.instance.recurrence and attrs.get("date", self.instance.date) != self.instance.date
+            )
+            if rescheduled and self.instance.eventregistration_set.exists():
+                raise serializers.ValidationError(
+                    {"recurrence": "The schedule of a recurring event cannot change once users have registered."}
+                )
+        return attrs
 
-    def __call__(self, serializer_field):
-        return serializer_field.context["event"]
+    def create(self, validated_data):
+        # Recurring events have a capacity per occurrence and no series-wide seat count.
+        validated_data["seats_left"] = None if validated_data.get("recurrence") else validated_data.get("capacity")
+        return super().create(validated_data)
 
-    def __repr__(self):
-        return "%s()" % self.__class__.__name__
+    def update(self, instance, validated_data):
+        capacity = validated_data.get("capacity", instance.capacity)
+        recurring = bool(validated_data.get("recurrence", instance.recurrence))
+        if capacity == instance.capacity and recurring == bool(instance.recurrence):
+            return super().update(instance, validated_data)
 
+        with transaction.atomic():
+            # Registrations take seats with an UPDATE on the event row, so the lock keeps the count stable.
+            Event.objects.select_for_update().only("pk").get(pk=instance.pk)
+            registrations = instance.eventregistration_set.order_by()
+            if recurring:
+                counts = registrations.values("occurrence").annotate(count=Count("id")).values_list("count", flat=True)
+                taken = max(counts, default=0)
+            else:
+                taken = registrations.count()
+            if capacity is not None and capacity < taken:
+                raise serializers.ValidationError(
+                    {"capacity": f"Capacity cannot be lower than the number of registered participants ({taken})."}
+                )
 
-class EventRegistrationSerializer(serializers.ModelSerializer):
-    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    event = serializers.HiddenField(default=CurrentEventDefault())
+            instance = super().update(instance, validated_data)
+            instance.seats_left = None if capacity is None or recurring else capacity - taken
+            Event.objects.filter(pk=instance.pk).update(seats_left=instance.seats_left)
+        return instance
 
-    class Meta:
-        model = EventRegistration
-        fields = ["user", "event"]
-        validators = [
-            UniqueTogetherValidator(
-                queryset=EventRegistration.objects.all(),
-                fields=("user", "event"),
-                message="You are already registered for this event.",
-            )
-        ]
+
+class EventRegistrationSerializer(serializers.Serializer):
+    """The register endpoint's body; the registration itself is inserted by ``EventRegistration.objects.register``."""
+
+    occurrence = serializers.DateTimeField(
+        required=False, allow_null=True, help_text="The occurrence to attend, required for recurring events."
+    )
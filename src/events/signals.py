@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from events.cache import invalidate_all, invalidate_event, invalidate_user_feeds
+from events.live import publish_event
+from events.models import ArchivedEvent, Event, EventRegistration, EventTombstone
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=EventRegistration)
+def add_participant(sender, instance, created, raw=False, **kwargs):
+    # The register endpoint counts itself in; this keeps ORM-created registrations (admin, fixtures) in step.
+    if created and not raw:
+        # EventRegistration.save runs in a transaction, so raising also discards the registration.
+        if not Event.objects.add_participant(instance.event_id):
+            raise IntegrityError("This event is fully booked.")
+        invalidate_event(instance.event_id)
+        publish_event(instance.event_id)
+        invalidate_user_feeds(instance.user_id)
+
+
+def is_event_deletion(origin):
+    return isinstance(origin, Event) or isinstance(origin, QuerySet) and origin.model is Event
+
+
+@receiver(post_delete, sender=EventRegistration)
+def remove_participant(sender, instance, origin=None, **kwargs):
+    # A deleted event drops out of its participants' feeds through its own version.
+    if not is_event_deletion(origin):
+        Event.objects.remove_participant(instance.event_id)
+        invalidate_event(instance.event_id)
+        publish_event(instance.event_id)
+        invalidate_user_feeds(instance.user_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_cached_event(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_event(instance.pk)
+        publish_event(instance.pk)
+        # The organizer may be new to the event, which is then missing from their cached feed.
+        invalidate_user_feeds(instance.organizer_id)
+
+
+@receiver(post_delete, sender=Event)
+def record_tombstone(sender, instance, **kwargs):
+    EventTombstone.objects.create(event_id=instance.pk)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins save last_login alone, so only saves that may write the username pay for the lookup.
+    if not raw and instance.pk is not None and (update_fields is None or "username" in update_fields):
+        instance._stored_username = (
+            sender._default_manager.filter(pk=instance.pk).values_list("username", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=User)
+def rename_organizer(sender, instance, created, raw=False, **kwargs):
+    # Events show their organizer's username: the new updated_at changes their ETags, invalidate_all the cache.
+    stored = instance.__dict__.pop("_stored_username", None)
+    if not created and not raw and stored is not None and stored != instance.username:
+        now = timezone.now()
+        Event.objects.filter(organizer=instance).update(updated_at=now)
+        ArchivedEvent.objects.filter(organizer=instance).update(updated_at=now)
+        invalidate_all()
@@ -0,0 +1,109 @@
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from events.models import EventTombstone
+
+
+class ResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "The cursor is older than the deletion history, a full resync is required."
+    default_code = "resync_required"
+
+
+def tombstone_horizon():
+    """Tombstones of events deleted before this moment may be pruned."""
+    return timezone.now() - timedelta(days=settings.EVENT_TOMBSTONE_RETENTION_DAYS)
+
+
+def prune_tombstones(before, batch_size):
+    """Delete up to ``batch_size`` tombstones of events deleted before ``before`` and return how many went."""
+    with transaction.atomic(using=router.db_for_write(EventTombstone)):
+        ids = list(
+            EventTombstone.objects.filter(deleted_at__lt=before)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        EventTombstone.objects.filter(id__in=ids).delete()
+    return len(ids)
+
+
+def encode_cursor(updated_at, event_id, tombstone_id, synced_at):
+    tokens = {
+        "u": updated_at.isoformat() if updated_at else None,
+        "i": event_id,
+        "t": tombstone_id,
+        "s": synced_at.isoformat(),
+    }
+    return base64.urlsafe_b64encode(json.dumps(tokens, separators=(",", ":")).encode()).decode("ascii")
+
+
+def decode_cursor(value):
+    try:
+        tokens = json.loads(base64.urlsafe_b64decode(value.encode("ascii")))
+        updated_at = parse_datetime(tokens["u"]) if tokens["u"] else None
+        synced_at = parse_datetime(tokens["s"])
+        if synced_at is None:
+            raise ValueError
+        return updated_at, int(tokens["i"]), int(tokens["t"]), synced_at
+    except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+        raise ValidationError({"since": "Invalid cursor."})
+
+
+def get_changes(queryset, since, limit):
+    """
+    Return the events changed and the ids deleted after the ``since`` cursor, oldest first.
+
+    Both walks are keyset range scans (``(updated_at, id)`` and the tombstone id), so a sync costs O(changes).
+    Rows younger than ``EVENT_SYNC_LAG`` are held back until concurrent transactions that may commit with an
+    older timestamp have settled, otherwise a client could step over them.
+
+    Cursors also record up to when their deletions are complete. Once that is older than the retention of the
+    tombstones, some of the deletions the client has not seen may be pruned, and it must sync from scratch.
+    """
+    horizon = timezone.now() - timedelta(seconds=settings.EVENT_SYNC_LAG)
+
+    if since:
+        updated_at, event_id, tombstone_id, synced_at = decode_cursor(since)
+        if synced_at < tombstone_horizon():
+            raise ResyncRequired()
+    else:
+        # A fresh mirror has nothing to delete, it starts from the current end of the tombstone log.
+        updated_at, event_id = None, 0
+        tombstone_id = EventTombstone.objects.aggregate(last=Max("id"))["last"] or 0
+
+    changed = queryset.filter(updated_at__lt=horizon)
+    if updated_at is not None:
+        changed = changed.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=event_id))
+    changed = list(changed.order_by("updated_at", "id")[: limit + 1])
+
+    deleted = list(
+        EventTombstone.objects.filter(id__gt=tombstone_id, deleted_at__lt=horizon)
+        .order_by("id")
+        .values_list("id", "event_id", "deleted_at")[: limit + 1]
+    )
+
+    # Every deletion before the horizon is returned, unless the batch cut them short after the last one sent.
+    synced_at = deleted[limit - 1][2] if len(deleted) > limit else horizon
+    has_more = len(changed) > limit or len(deleted) > limit
+    changed, deleted = changed[:limit], deleted[:limit]
+    if changed:
+        updated_at, event_id = changed[-1].updated_at, changed[-1].id
+    if deleted:
+        tombstone_id = deleted[-1][0]
+
+    return {
+        "changed": changed,
+        "deleted": [pk for _, pk, _ in deleted],
+        "cursor": encode_cursor(updated_at, event_id, tombstone_id, synced_at),
+        "has_more": has_more,
+    }
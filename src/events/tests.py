@@ -1,13 +1,51 @@
-from datetime import timedelta
+import asyncio
+import csv
+import json
+import random
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+from itertools import product
+from unittest import skipUnless
 from unittest.mock import patch
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections
+from django.db.models import Count, F
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APITestCase
-
-from events.models import Event, EventRegistration
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from event_management.handlers import StreamingASGIHandler
+from event_management.instrumentation import QueryRecorder
+from event_management.routers import ReplicaRouter, pin_key, replica_reads
+from event_management.testing import QueryBudgetMixin
+from event_management.throttling import RegisterRateThrottle
+from events import async_views, benchmark
+from events.admin import EstimatedCountPaginator
+from events.feeds import fold
+from events.filters import EventFilter
+from events.geo import covering_cells, encode, extent
+from events.live import InProcessBroker, PostgresBroker, get_broker
+from events.models import ArchivedEvent, ArchivedEventRegistration, Event, EventRegistration, EventTombstone
+from events.recurrence import Rule
+from events.seeding import Seeder
+from events.serializers import EventSerializer
+from events.views import EventViewSet
+from notifications.models import OutboxEmail
 
 User = get_user_model()
 
@@ -45,8 +83,8 @@ class EventAPITestCase(APITestCase):
         response = self.client.get(self.list_url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        self.assertEqual(response.data[0]["title"], self.event1.title)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(response.data["results"][0]["title"], self.event1.title)
 
     def test_get_event_list_authenticated_success(self):
         for user in [self.user1, self.user2]:
@@ -54,28 +92,28 @@ class EventAPITestCase(APITestCase):
             response = self.client.get(self.list_url)
 
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(len(response.data), 2)
+            self.assertEqual(len(response.data["results"]), 2)
 
     def test_get_search_by_location_success(self):
         response = self.client.get(self.list_url + "?search=paris")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["location"].lower(), "paris")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["location"].lower(), "paris")
 
     def test_get_search_by_title_success(self):
         response = self.client.get(self.list_url + "?search=EXPO")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertIn("EXPO", response.data[0]["title"].upper())
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIn("EXPO", response.data["results"][0]["title"].upper())
 
     def test_get_search_by_organizer_success(self):
         response = self.client.get(self.list_url + f"?search={self.user1.username}")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["organizer"], str(self.user1))
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["organizer"], str(self.user1))
 
     def test_get_filter_by_date_success(self):
         start = (self.now + timedelta(days=6)).strftime("%Y-%m-%dT%H:%M:%S")
@@ -84,28 +122,28 @@ class EventAPITestCase(APITestCase):
         response = self.client.get(self.list_url + f"?end_date={end}&start_date={start}")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["title"], "Art Expo")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["title"], "Art Expo")
 
     def test_get_filter_organised_by_me_unauthenticated_success(self):
         response = self.client.get(self.list_url + "?organized_by_me=true")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
     def test_get_filter_organised_by_me_success(self):
         self.client.force_authenticate(user=self.user1)
         response = self.client.get(self.list_url + "?organized_by_me=true")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["title"], "Music Fest")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["title"], "Music Fest")
 
     def test_get_filter_participated_by_me_unauthenticated_success(self):
         response = self.client.get(self.list_url + "?participated_by_me=true")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
     def test_get_filter_participated_by_me_success(self):
         EventRegistration.objects.create(user=self.user1, event=self.event2)
@@ -113,8 +151,8 @@ class EventAPITestCase(APITestCase):
         response = self.client.get(self.list_url + "?participated_by_me=true")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["title"], "Art Expo")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["title"], "Art Expo")
 
     def test_create_event_authenticated__success(self):
         self.client.force_authenticate(user=self.user1)
@@ -254,6 +292,122 @@ class EventAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+class EventPaginationAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        now = timezone.now()
+
+        cls.events = [
+            Event.objects.create(
+                title=f"Event {i}",
+                description="Description",
+                date=now + timedelta(days=i // 2),
+                location="Berlin" if i % 2 else "Paris",
+                organizer=cls.user,
+            )
+            for i in range(7)
+        ]
+        cls.list_url = reverse("event-list")
+
+    def collect(self, url, link="next"):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            page = [event["id"] for event in response.data["results"]]
+            ids = ids + page if link == "next" else page + ids
+            url = response.data[link]
+        return ids, response
+
+    def test_walk_forward_success(self):
+        expected = list(Event.objects.order_by("date", "id").values_list("id", flat=True))
+
+        ids, response = self.collect(self.list_url + "?page_size=2")
+
+        self.assertEqual(ids, expected)
+        self.assertIsNone(response.data["next"])
+
+    def test_walk_backward_success(self):
+        expected = list(Event.objects.order_by("date", "id").values_list("id", flat=True))
+
+        response = self.client.get(self.list_url + "?page_size=2")
+        while response.data["next"]:
+            last = response
+            response = self.client.get(response.data["next"])
+        ids, response = self.collect(last.data["next"], link="previous")
+
+        self.assertEqual(ids, expected)
+        self.assertIsNone(response.data["previous"])
+
+    def test_pagination_with_search_success(self):
+        expected = list(Event.objects.filter(location="Berlin").order_by("date", "id").values_list("id", flat=True))
+
+        ids, response = self.collect(self.list_url + "?page_size=2&search=berlin")
+
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor_fail(self):
+        for cursor in ["invalid", "eyJwIjpbXX0="]:
+            response = self.client.get(self.list_url + f"?cursor={cursor}")
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.data, {"message": "Invalid cursor"})
+
+
+class EventSearchAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username="jazzlover", email="test1@example.com", password="testpass123", first_name="Miles"
+        )
+        now = timezone.now()
+
+        cls.title_match = Event.objects.create(
+            title="Jazz Night",
+            description="Live music",
+            date=now + timedelta(days=2),
+            location="Lisbon",
+            organizer=cls.user,
+        )
+        cls.description_match = Event.objects.create(
+            title="Open Air",
+            description="Some jazz and blues",
+            date=now + timedelta(days=1),
+            location="Porto",
+            organizer=cls.user,
+        )
+        cls.list_url = reverse("event-list")
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search requires PostgreSQL")
+    def test_full_text_search_ranked_success(self):
+        response = self.client.get(self.list_url + "?search=jazz")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [event["id"] for event in response.data["results"]], [self.title_match.id, self.description_match.id]
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search requires PostgreSQL")
+    def test_full_text_search_by_organizer_name_success(self):
+        response = self.client.get(self.list_url + "?search=miles")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    @override_settings(EVENT_SEARCH_BACKEND="rest_framework.filters.SearchFilter")
+    def test_configured_search_backend_success(self):
+        response = self.client.get(self.list_url + "?search=lisbon")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event["id"] for event in response.data["results"]], [self.title_match.id])
+
+
 class EventRegistrationAPITestCase(APITestCase):
 
     @classmethod
@@ -282,15 +436,17 @@ class EventRegistrationAPITestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
-    @patch.object(User, "email_user")
-    def test_register_user_success(self, mock_email_user):
+    def test_register_user_success(self):
         self.client.force_authenticate(user=self.user2)
         response = self.client.post(self.register_url(self.event.id))
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data, {"detail": "Registration successful."})
 
-        mock_email_user.assert_called_once()
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.recipient, self.user2.email)
+        self.assertEqual(email.status, OutboxEmail.Status.PENDING)
 
     def test_register_registered_user_fail(self):
         self.client.force_authenticate(user=self.user3)
@@ -305,7 +461,1969 @@ class EventRegistrationAPITestCase(APITestCase):
             },
         )
 
+    def test_register_single_insert_success(self):
+        self.client.force_authenticate(user=self.user2)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.register_url(self.event.id))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        statements = [query["sql"] for query in queries if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        self.assertEqual(len(statements), 3)
+        self.assertIn("ON CONFLICT DO NOTHING", statements[0])
+        self.assertTrue(statements[2].startswith("UPDATE"))
+        self.assertTrue(EventRegistration.objects.filter(user=self.user2, event=self.event).exists())
+
+    def test_register_non_existent_event_fail(self):
+        self.client.force_authenticate(user=self.user2)
+
+        for pk in [1000, "invalid"]:
+            response = self.client.post(self.register_url(pk))
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.data, {"message": "No Event matches the given query."})
+
     def test_register_unauthorized_fail(self):
         response = self.client.post(self.register_url(self.event.id))
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class EventCapacityAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.organizer = User.objects.create_user(username="organizer", email="org@example.com", password="testpass123")
+        cls.users = [
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com", password="testpass123")
+            for i in range(3)
+        ]
+        cls.list_url = reverse("event-list")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.organizer)
+        data = {
+            "title": "Limited Event",
+            "description": "Only two seats",
+            "date": (timezone.now() + timedelta(days=3)).isoformat(),
+            "location": "Kyiv",
+            "capacity": 2,
+        }
+        response = self.client.post(self.list_url, data, format="json")
+        self.assertEqual(response.data["seats_left"], 2)
+        self.event = Event.objects.get(pk=response.data["id"])
+
+    def register(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post(reverse("event-register", kwargs={"pk": self.event.id}))
+
+    def detail_url(self):
+        return reverse("event-detail", kwargs={"pk": self.event.id})
+
+    def test_register_until_full_fail(self):
+        for user in self.users[:2]:
+            self.assertEqual(self.register(user).status_code, status.HTTP_201_CREATED)
+
+        response = self.register(self.users[2])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data,
+            {"message": "Validation error", "errors": {"non_field_errors": "This event is fully booked."}},
+        )
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_left, 0)
+        self.assertEqual(self.event.eventregistration_set.count(), 2)
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+    def test_register_full_event_already_registered_fail(self):
+        for user in self.users[:2]:
+            self.register(user)
+
+        response = self.register(self.users[0])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"]["non_field_errors"], "You are already registered for this event.")
+
+    def test_update_capacity_success(self):
+        self.register(self.users[0])
+
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.patch(self.detail_url(), {"capacity": 5}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["seats_left"], 4)
+
+        response = self.client.patch(self.detail_url(), {"capacity": None}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["seats_left"])
+
+    def test_update_capacity_below_registrations_fail(self):
+        for user in self.users[:2]:
+            self.register(user)
+
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.patch(self.detail_url(), {"capacity": 1}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["errors"]["capacity"], "Capacity cannot be lower than the number of registered participants (2)."
+        )
+
+    def test_update_event_keeps_seats_success(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        self.register(self.users[0])
+
+        stale.title = "Renamed"
+        stale.save()
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.title, "Renamed")
+        self.assertEqual(self.event.seats_left, 1)
+
+    def test_create_event_sets_seats_success(self):
+        event = Event.objects.create(
+            title="ORM Event", description="Description", date=timezone.now(), location="Kyiv", capacity=3
+        )
+
+        event.refresh_from_db()
+        self.assertEqual(event.seats_left, 3)
+
+    def test_create_registration_full_event_fail(self):
+        for user in self.users[:2]:
+            self.register(user)
+        registration = EventRegistration(user=self.users[2], event=self.event)
+
+        with self.assertRaisesMessage(ValidationError, "This event is fully booked."):
+            registration.full_clean()
+        with self.assertRaisesMessage(IntegrityError, "This event is fully booked."):
+            registration.save()
+
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.seats_left, self.event.participant_count), (0, 2))
+        self.assertFalse(EventRegistration.objects.filter(user=self.users[2]).exists())
+
+    def test_delete_registration_releases_seat_success(self):
+        self.register(self.users[0])
+
+        EventRegistration.objects.get(user=self.users[0]).delete()
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.seats_left, 2)
+
+
+class EventParticipantCountAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = [
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com", password="testpass123")
+            for i in range(3)
+        ]
+        now = timezone.now()
+        cls.events = [
+            Event.objects.create(
+                title=f"Event {i}", description="Description", date=now + timedelta(days=i), location="Rome"
+            )
+            for i in range(3)
+        ]
+        for event, attendees in zip(cls.events, [1, 3, 2]):
+            for user in cls.users[:attendees]:
+                EventRegistration.objects.create(user=user, event=event)
+
+        cls.list_url = reverse("event-list")
+
+    def test_participant_count_maintained_success(self):
+        new_user = User.objects.create_user(username="new", email="new@example.com", password="testpass123")
+        self.client.force_authenticate(user=new_user)
+        self.client.post(reverse("event-register", kwargs={"pk": self.events[0].id}))
+
+        response = self.client.get(reverse("event-detail", kwargs={"pk": self.events[0].id}))
+        self.assertEqual(response.data["participant_count"], 2)
+
+        EventRegistration.objects.filter(event=self.events[0]).first().delete()
+
+        response = self.client.get(reverse("event-detail", kwargs={"pk": self.events[0].id}))
+        self.assertEqual(response.data["participant_count"], 1)
+
+    def test_ordering_by_popularity_success(self):
+        response = self.client.get(self.list_url + "?ordering=-participant_count&page_size=2")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event["participant_count"] for event in response.data["results"]], [3, 2])
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual([event["participant_count"] for event in response.data["results"]], [1])
+
+    def test_ordering_by_popularity_without_aggregate_success(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.list_url + "?ordering=-participant_count")
+
+        self.assertFalse(any("COUNT(" in query["sql"].upper() for query in queries))
+
+    def test_filter_by_participants_success(self):
+        response = self.client.get(self.list_url + "?min_participants=2&max_participants=2")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event["id"] for event in response.data["results"]], [self.events[2].id])
+
+    def test_recount_participants_command_success(self):
+        Event.objects.update(participant_count=0)
+
+        call_command("recount_participants", "--batch-size", "1", stdout=StringIO())
+
+        counts = dict(Event.objects.values_list("id", "participant_count"))
+        self.assertEqual(counts, {self.events[0].id: 1, self.events[1].id: 3, self.events[2].id: 2})
+
+
+class EventConditionalGetAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        cls.attendee = User.objects.create_user(username="testuser2", email="test2@example.com", password="testpass123")
+        now = timezone.now()
+        cls.events = [
+            Event.objects.create(
+                title=f"Event {i}",
+                description="Description",
+                date=now + timedelta(days=i),
+                location="Riga",
+                organizer=cls.user,
+            )
+            for i in range(3)
+        ]
+        cls.list_url = reverse("event-list")
+        cls.detail_url = reverse("event-detail", kwargs={"pk": cls.events[0].id})
+
+    def test_detail_not_modified_success(self):
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", response)
+        self.assertFalse(response["ETag"].startswith("W/"))
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(cached["ETag"], response["ETag"])
+        self.assertEqual(len(queries), 1)
+
+        cached = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_modified_after_registration_success(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.client.force_authenticate(user=self.attendee)
+        self.client.post(reverse("event-register", kwargs={"pk": self.events[0].id}))
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["participant_count"], 1)
+
+    def test_list_not_modified_success(self):
+        etag = self.client.get(self.list_url)["ETag"]
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(self.list_url + "?page_size=1", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_modified_after_update_success(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        self.events[1].title = "Renamed"
+        self.events[1].save()
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][1]["title"], "Renamed")
+
+    def test_list_modified_after_delete_success(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        self.events[0].delete()
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def window_events(self):
+        # The last event comes after the others in date order but was written first, so it never holds the newest
+        # updated_at of a page it slides into.
+        now = timezone.now()
+        last = Event.objects.create(
+            title="Last", description="Description", date=now + timedelta(days=30), location="Oslo", organizer=self.user
+        )
+        Event.objects.exclude(pk=last.pk).delete()
+        events = [
+            Event.objects.create(
+                title=f"Event {i}",
+                description="Description",
+                date=now + timedelta(days=10 + i),
+                location="Oslo",
+                organizer=self.user,
+            )
+            for i in range(3)
+        ]
+        return events, last
+
+    def test_list_modified_after_page_row_deleted_success(self):
+        events, last = self.window_events()
+        response = self.client.get(self.list_url, {"page_size": 2})
+        self.assertEqual([event["id"] for event in response.data["results"]], [events[0].id, events[1].id])
+        self.assertNotIn("Last-Modified", response)
+
+        events[1].delete()
+        response = self.client.get(self.list_url, {"page_size": 2}, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event["id"] for event in response.data["results"]], [events[0].id, events[2].id])
+
+    def test_list_modified_after_page_row_moved_success(self):
+        events, last = self.window_events()
+        etag = self.client.get(self.list_url, {"page_size": 2})["ETag"]
+
+        events[0].date = last.date + timedelta(days=1)
+        events[0].save()
+        response = self.client.get(self.list_url, {"page_size": 2}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event["id"] for event in response.data["results"]], [events[1].id, events[2].id])
+
+        etag = response["ETag"]
+        events[2].date = events[1].date - timedelta(hours=1)
+        events[2].save()
+        response = self.client.get(self.list_url, {"page_size": 2}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event["id"] for event in response.data["results"]], [events[2].id, events[1].id])
+
+
+@override_settings(EVENT_SYNC_LAG=0)
+class EventChangesAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        cls.attendee = User.objects.create_user(username="testuser2", email="test2@example.com", password="testpass123")
+        now = timezone.now()
+        cls.events = [
+            Event.objects.create(
+                title=f"Event {i}",
+                description="Description",
+                date=now + timedelta(days=i),
+                location="Riga",
+                organizer=cls.user,
+            )
+            for i in range(3)
+        ]
+        cls.url = reverse("event-changes")
+
+    def test_initial_sync_success(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event["id"] for event in response.data["changed"]], [event.id for event in self.events])
+        self.assertEqual(response.data["deleted"], [])
+        self.assertFalse(response.data["has_more"])
+
+        response = self.client.get(self.url, {"since": response.data["cursor"]})
+
+        self.assertEqual(response.data["changed"], [])
+        self.assertEqual(response.data["deleted"], [])
+
+    def test_incremental_sync_success(self):
+        cursor = self.client.get(self.url).data["cursor"]
+        self.events[1].title = "Renamed"
+        self.events[1].save()
+        self.client.force_authenticate(user=self.attendee)
+        self.client.post(reverse("event-register", kwargs={"pk": self.events[2].id}))
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url, {"since": cursor})
+
+        self.assertEqual([event["id"] for event in response.data["changed"]], [self.events[1].id, self.events[2].id])
+        self.assertEqual(response.data["changed"][0]["title"], "Renamed")
+        self.assertEqual(response.data["changed"][1]["participant_count"], 1)
+
+    def test_deleted_events_success(self):
+        cursor = self.client.get(self.url).data["cursor"]
+        self.client.force_authenticate(user=self.user)
+        self.client.delete(reverse("event-detail", kwargs={"pk": self.events[0].id}))
+
+        response = self.client.get(self.url, {"since": cursor})
+
+        self.assertEqual(response.data["changed"], [])
+        self.assertEqual(response.data["deleted"], [self.events[0].id])
+
+        response = self.client.get(self.url, {"since": response.data["cursor"]})
+
+        self.assertEqual(response.data["deleted"], [])
+
+    def test_paged_sync_success(self):
+        response = self.client.get(self.url, {"page_size": 2})
+
+        self.assertEqual(len(response.data["changed"]), 2)
+        self.assertTrue(response.data["has_more"])
+
+        response = self.client.get(self.url, {"page_size": 2, "since": response.data["cursor"]})
+
+        self.assertEqual([event["id"] for event in response.data["changed"]], [self.events[2].id])
+        self.assertFalse(response.data["has_more"])
+
+    @override_settings(EVENT_SYNC_LAG=60)
+    def test_recent_changes_held_back_success(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data["changed"], [])
+
+    def test_invalid_cursor_fail(self):
+        response = self.client.get(self.url, {"since": "garbage"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_past_retention_fail(self):
+        cursor = self.client.get(self.url).data["cursor"]
+
+        with override_settings(EVENT_TOMBSTONE_RETENTION_DAYS=0):
+            response = self.client.get(self.url, {"since": cursor})
+
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertEqual(
+            response.data, {"message": "The cursor is older than the deletion history, a full resync is required."}
+        )
+        self.assertEqual(self.client.get(self.url, {"since": cursor}).status_code, status.HTTP_200_OK)
+
+    def test_prune_tombstones_success(self):
+        tombstones = EventTombstone.objects.bulk_create(EventTombstone(event_id=i) for i in range(1000, 1004))
+        EventTombstone.objects.filter(pk__in=[tombstone.pk for tombstone in tombstones[:3]]).update(
+            deleted_at=timezone.now() - timedelta(days=31)
+        )
+        out = StringIO()
+
+        call_command("prune_tombstones", batch_size=2, stdout=out)
+
+        self.assertEqual(list(EventTombstone.objects.values_list("event_id", flat=True)), [1003])
+        self.assertIn("Pruned 3 tombstone(s).", out.getvalue())
+
+
+class EventQueryBudgetAPITestCase(QueryBudgetMixin, APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = [
+            User.objects.create_user(username=f"testuser{i}", email=f"test{i}@example.com", password="testpass123")
+            for i in range(10)
+        ]
+        cls.now = timezone.now()
+        cls.events = [
+            Event.objects.create(
+                title=f"Event {i}",
+                description="Description",
+                date=cls.now + timedelta(days=i + 1),
+                location="Riga",
+                organizer=user,
+                capacity=10,
+            )
+            for i, user in enumerate(cls.users)
+        ]
+        for user in cls.users[1:]:
+            EventRegistration.objects.create(user=user, event=cls.events[0])
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="testpass123", is_staff=True
+        )
+        cls.list_url = reverse("event-list")
+        cls.detail_url = reverse("event-detail", kwargs={"pk": cls.events[0].id})
+        cls.data = {
+            "title": "Budget Event",
+            "description": "Description",
+            "date": (cls.now + timedelta(days=30)).isoformat(),
+            "location": "Riga",
+            "capacity": 20,
+        }
+
+    def test_list_budget_success(self):
+        with self.assertMaxQueries(2):
+            response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data["results"]), 10)
+
+        with self.assertMaxQueries(2):
+            self.client.get(self.list_url, {"search": "Event", "ordering": "-participant_count"})
+
+        self.client.force_authenticate(user=self.users[1])
+        with self.assertMaxQueries(2):
+            self.client.get(self.list_url, {"organized_by_me": "true", "participated_by_me": "true"})
+
+    def test_retrieve_budget_success(self):
+        with self.assertMaxQueries(2):
+            self.client.get(self.detail_url)
+
+    def test_create_budget_success(self):
+        self.client.force_authenticate(user=self.users[0])
+        with self.assertMaxQueries(1):
+            response = self.client.post(self.list_url, self.data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_update_budget_success(self):
+        self.client.force_authenticate(user=self.users[0])
+        with self.assertMaxQueries(2):
+            self.client.patch(self.detail_url, {"title": "Renamed"})
+        with self.assertMaxQueries(7):
+            response = self.client.put(self.detail_url, self.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_destroy_budget_success(self):
+        self.client.force_authenticate(user=self.users[0])
+        with self.assertMaxQueries(5):
+            response = self.client.delete(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_register_budget_success(self):
+        self.client.force_authenticate(user=self.users[0])
+        url = reverse("event-register", kwargs={"pk": self.events[1].id})
+        with self.assertMaxQueries(5):
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with self.assertMaxQueries(4):
+            self.client.post(url)
+
+    @override_settings(EVENT_SYNC_LAG=0)
+    def test_changes_budget_success(self):
+        with self.assertMaxQueries(3):
+            response = self.client.get(reverse("event-changes"))
+        self.assertEqual(len(response.data["changed"]), 10)
+
+    def test_cache_stats_budget_success(self):
+        self.client.force_authenticate(user=self.admin)
+        with self.assertMaxQueries(0):
+            self.client.get(reverse("event-cache-stats"))
+
+    def test_repeated_queries_detected_fail(self):
+        with self.assertRaisesMessage(AssertionError, "Repeated queries executed"):
+            with self.assertMaxQueries(20):
+                [str(event.organizer) for event in Event.objects.all()]
+
+    def test_server_timing_header_success(self):
+        response = self.client.get(self.list_url)
+
+        self.assertRegex(response["Server-Timing"], r'^db;dur=\d+\.\d{2};desc="2 queries"$')
+
+    @override_settings(QUERY_REPEAT_THRESHOLD=0)
+    def test_repeated_queries_logged_success(self):
+        with self.assertLogs("event_management.queries", "WARNING") as logs:
+            self.client.get(self.list_url)
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["path"], self.list_url)
+        self.assertEqual(record["queries"], 2)
+        self.assertEqual(len(record["repeated"]), 2)
+
+
+class EventExportAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.organizer = User.objects.create_user(
+            username="organizer", email="organizer@example.com", password="testpass123"
+        )
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="testpass123", is_staff=True
+        )
+        cls.attendees = [
+            User.objects.create_user(
+                username=f"attendee{i}", email=f"attendee{i}@example.com", password="testpass123", first_name="Ann"
+            )
+            for i in range(3)
+        ]
+        now = timezone.now()
+        cls.events = [
+            Event.objects.create(
+                title=f"Event, {i}",
+                description='Has "quotes"',
+                date=now + timedelta(days=i + 1),
+                location="Riga",
+                organizer=cls.organizer,
+            )
+            for i in range(3)
+        ]
+        for attendee in cls.attendees:
+            EventRegistration.objects.create(user=attendee, event=cls.events[0])
+        cls.url = reverse("event-export")
+        cls.registrations_url = reverse("event-export-registrations", kwargs={"pk": cls.events[0].id})
+
+    @staticmethod
+    def content(response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_csv_success(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="events.csv"')
+        rows = list(csv.reader(StringIO(self.content(response))))
+        self.assertEqual(rows[0][:3], ["id", "title", "description"])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][1:3], ["Event, 0", 'Has "quotes"'])
+        self.assertEqual(rows[1][5], "organizer")
+
+    def test_export_ndjson_filtered_success(self):
+        self.client.force_authenticate(user=self.admin)
+        start_date = (self.events[1].date - timedelta(hours=1)).isoformat()
+
+        response = self.client.get(self.url, {"output": "ndjson", "start_date": start_date})
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.events[1].id, self.events[2].id])
+        self.assertEqual(rows[0]["participant_count"], 0)
+
+    def test_export_invalid_output_fail(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {"output": "xml"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_non_admin_fail(self):
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_registrations_success(self):
+        self.client.force_authenticate(user=self.organizer)
+        response = self.client.get(self.registrations_url)
+
+        rows = list(csv.DictReader(StringIO(self.content(response))))
+        self.assertEqual([row["username"] for row in rows], ["attendee0", "attendee1", "attendee2"])
+        self.assertEqual(rows[0]["email"], "attendee0@example.com")
+
+        response = self.client.get(self.registrations_url, {"output": "ndjson"})
+
+        self.assertEqual(len(self.content(response).splitlines()), 3)
+
+    async def test_export_asgi_streams_success(self):
+        token = await sync_to_async(AccessToken.for_user)(self.admin)
+        with patch("events.export.CHUNK_SIZE", 2):
+            response = await self.async_client.get(self.url, headers={"Authorization": f"Bearer {token}"})
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+
+        rows = list(csv.reader(StringIO(b"".join(chunks).decode())))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[3][1], "Event, 2")
+
+    def test_export_registrations_not_organizer_fail(self):
+        self.client.force_authenticate(user=self.attendees[0])
+        response = self.client.get(self.registrations_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.registrations_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class EventAdminTestCase(QueryBudgetMixin, APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="testpass123")
+        cls.users = [
+            User.objects.create_user(username=f"testuser{i}", email=f"test{i}@example.com", password="testpass123")
+            for i in range(10)
+        ]
+        now = timezone.now()
+        cls.events = [
+            Event.objects.create(
+                title=f"Event {i}",
+                description="Description",
+                date=now + timedelta(days=i + 1),
+                location="Riga",
+                organizer=user,
+            )
+            for i, user in enumerate(cls.users)
+        ]
+        for user in cls.users[1:]:
+            EventRegistration.objects.create(user=user, event=cls.events[0])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_event_changelist_success(self):
+        with self.assertMaxQueries(6):
+            response = self.client.get(reverse("admin:events_event_changelist"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "testuser3")
+        self.assertFalse(response.context["cl"].show_full_result_count)
+
+    def test_event_change_page_links_registrations_success(self):
+        with self.assertMaxQueries(8):
+            response = self.client.get(reverse("admin:events_event_change", args=[self.events[0].pk]))
+
+        url = reverse("admin:events_eventregistration_changelist") + f"?event__id__exact={self.events[0].pk}"
+        self.assertContains(response, f'<a href="{url}">9 participant(s)</a>', html=True)
+        self.assertNotContains(response, "testuser5")
+
+    def test_registration_changelist_filtered_by_event_success(self):
+        url = reverse("admin:events_eventregistration_changelist")
+
+        with self.assertMaxQueries(6):
+            response = self.client.get(url, {"event__id__exact": self.events[0].pk})
+
+        self.assertEqual(response.context["cl"].result_count, 9)
+        self.assertContains(response, "testuser5")
+
+    def test_registration_changelist_filters_success(self):
+        response = self.client.get(reverse("admin:events_eventregistration_changelist"))
+
+        self.assertEqual([spec.title for spec in response.context["cl"].filter_specs], ["date"])
+
+    def test_estimated_count_paginator_success(self):
+        paginator = EstimatedCountPaginator(Event.objects.order_by("id"), 5)
+
+        self.assertEqual(paginator.count, 10)
+        self.assertEqual(paginator.num_pages, 2)
+
+    @skipUnless(connection.vendor == "postgresql", "Planner estimates require PostgreSQL.")
+    def test_estimated_count_paginator_postgres_success(self):
+        paginator = EstimatedCountPaginator(Event.objects.order_by("id"), 5)
+        paginator.estimate_threshold = 0
+
+        self.assertIsInstance(paginator.estimate_count(), int)
+
+
+class EventQueryPlanTestCase(TestCase):
+    """Every filter combination of the event list must be answered from indexes, never by scanning a table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Seeder().seed(users=200, events=2000, registrations=5000)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        cls.user = User.objects.annotate(events=Count("organized_events")).filter(events__gt=0).first()
+        cls.start = timezone.now() + timedelta(days=30)
+
+    @staticmethod
+    def full_scans(plan):
+        if connection.vendor == "postgresql":
+            return re.findall(r"Seq Scan on (\w+)", plan)
+        # SQLite: "SCAN table" walks the whole table, "SCAN table USING INDEX" walks an index in order.
+        return re.findall(r"\bSCAN (\w+)\b(?! USING)", plan)
+
+    def test_filters_use_indexes_success(self):
+        request = RequestFactory().get(reverse("event-list"))
+        request.user = self.user
+        choices = [None, "true", "false"]
+        ranges = [
+            {},
+            {"start_date": self.start},
+            {"start_date": self.start, "end_date": self.start + timedelta(days=7)},
+        ]
+        orderings = [("date", "id"), ("-participant_count", "id")]
+
+        for organized, participated, dates, ordering in product(choices, choices, ranges, orderings):
+            data = {"organized_by_me": organized, "participated_by_me": participated, **dates}
+            data = {name: value for name, value in data.items() if value is not None}
+            with self.subTest(data=data, ordering=ordering):
+                queryset = EventFilter(data, EventViewSet.queryset, request=request).qs.order_by(*ordering)[:21]
+                plan = queryset.explain()
+
+                self.assertEqual(self.full_scans(plan), [], plan)
+
+
+class EventAsyncAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        cls.other = User.objects.create_user(username="testuser2", email="test2@example.com", password="testpass123")
+        now = timezone.now()
+        cls.events = [
+            Event.objects.create(
+                title=f"Event {i}",
+                description="Description",
+                date=now + timedelta(days=i + 1),
+                location="Riga" if i % 2 else "Berlin",
+                organizer=cls.user if i < 3 else cls.other,
+            )
+            for i in range(5)
+        ]
+        cls.list_url = reverse("async-event-list")
+        cls.token = str(AccessToken.for_user(cls.user))
+
+    def test_async_views_success(self):
+        self.assertTrue(iscoroutinefunction(async_views.event_list))
+        self.assertTrue(iscoroutinefunction(async_views.event_detail))
+
+    async def test_list_matches_sync_success(self):
+        response = await self.async_client.get(self.list_url, {"page_size": 2})
+        expected = await sync_to_async(self.client.get)(reverse("event-list"), {"page_size": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], expected.json()["results"])
+        # The sync list also reads its validators; the async one only reads the page.
+        self.assertIn('desc="2 queries"', expected["Server-Timing"])
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+        response = await self.async_client.get(response.json()["next"])
+
+        self.assertEqual([event["id"] for event in response.json()["results"]], [self.events[2].id, self.events[3].id])
+
+    async def test_list_search_and_filters_success(self):
+        response = await self.async_client.get(self.list_url, {"search": "Berlin"})
+
+        self.assertEqual(len(response.json()["results"]), 3)
+
+        response = await self.async_client.get(
+            self.list_url, {"organized_by_me": "true"}, headers={"Authorization": f"Bearer {self.token}"}
+        )
+
+        self.assertEqual([event["organizer"] for event in response.json()["results"]], ["testuser1"] * 3)
+
+    async def test_detail_success(self):
+        response = await self.async_client.get(reverse("async-event-detail", kwargs={"pk": self.events[0].id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "Event 0")
+        self.assertEqual(response.json()["organizer"], "testuser1")
+
+    async def test_detail_not_found_fail(self):
+        for pk in (0, "abc"):
+            response = await self.async_client.get(reverse("async-event-detail", kwargs={"pk": pk}))
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.json(), {"message": "No Event matches the given query."})
+
+    async def test_invalid_requests_fail(self):
+        response = await self.async_client.get(self.list_url, {"cursor": "garbage"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = await self.async_client.get(self.list_url, headers={"Authorization": "Bearer garbage"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = await self.async_client.post(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+@override_settings(DATABASE_REPLICAS=["default"])
+class EventReplicaRoutingAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        cls.event = Event.objects.create(
+            title="Event", description="Description", date=timezone.now() + timedelta(days=1), location="Riga"
+        )
+        cls.list_url = reverse("event-list")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_router_success(self):
+        router = ReplicaRouter()
+
+        self.assertEqual(router.db_for_read(Event), "default")
+        self.assertEqual(router.db_for_write(Event), "default")
+
+        with override_settings(DATABASE_REPLICAS=["replica"]):
+            self.assertTrue(router.allow_migrate("default", "events"))
+            self.assertFalse(router.allow_migrate("replica", "events"))
+            token = replica_reads.set(True)
+            try:
+                self.assertEqual(router.db_for_read(Event), "replica")
+                self.assertEqual(router.db_for_write(Event), "default")
+            finally:
+                replica_reads.reset(token)
+
+    @patch("event_management.routers.random.choice", return_value="default")
+    def test_reads_use_replicas_success(self, choice):
+        self.client.get(self.list_url)
+        self.client.get(reverse("event-detail", kwargs={"pk": self.event.pk}))
+
+        self.assertTrue(choice.called)
+        self.assertFalse(replica_reads.get())
+
+    @patch("event_management.routers.random.choice", return_value="default")
+    def test_changes_use_primary_success(self, choice):
+        response = self.client.get(reverse("event-changes"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        choice.assert_not_called()
+
+    @patch("event_management.routers.random.choice", return_value="default")
+    def test_writes_use_primary_success(self, choice):
+        self.client.force_authenticate(user=self.user)
+        self.client.post(reverse("event-register", kwargs={"pk": self.event.pk}))
+
+        choice.assert_not_called()
+
+    @patch("event_management.routers.random.choice", return_value="default")
+    def test_reads_pinned_after_write_success(self, choice):
+        self.client.force_authenticate(user=self.user)
+        self.client.post(reverse("event-register", kwargs={"pk": self.event.pk}))
+
+        self.client.get(self.list_url)
+        choice.assert_not_called()
+
+        cache.delete(pin_key(self.user.pk))
+        self.client.get(self.list_url)
+        self.assertTrue(choice.called)
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "Set DB_REPLICAS to test against a replica database.")
+class EventReplicaDatabaseTest(TransactionTestCase):
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        self.client = APIClient()
+
+    def aliases(self, recorder):
+        return {query["alias"] for query in recorder.queries}
+
+    def test_read_your_writes_success(self):
+        with QueryRecorder() as recorder:
+            self.client.get(reverse("event-list"))
+        self.assertTrue(self.aliases(recorder) <= set(settings.DATABASE_REPLICAS))
+
+        self.client.force_authenticate(user=self.user)
+        data = {"title": "Event", "description": "Description", "date": timezone.now().isoformat(), "location": "Riga"}
+        with QueryRecorder() as recorder:
+            self.client.post(reverse("event-list"), data)
+        self.assertEqual(self.aliases(recorder), {"default"})
+
+        with QueryRecorder() as recorder:
+            response = self.client.get(reverse("event-list"))
+        self.assertEqual(self.aliases(recorder), {"default"})
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class EventArchiveAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        cls.attendee = User.objects.create_user(username="testuser2", email="test2@example.com", password="testpass123")
+        now = timezone.now()
+        cls.events = [
+            Event.objects.create(
+                title=f"Event {days}",
+                description="Description",
+                date=now + timedelta(days=days),
+                location="Riga",
+                organizer=cls.user,
+                capacity=10,
+                seats_left=10,
+            )
+            for days in (-600, -500, -400, -10, 1, 2)
+        ]
+        EventRegistration.objects.create(user=cls.attendee, event=cls.events[1])
+        EventRegistration.objects.create(user=cls.attendee, event=cls.events[4])
+        cls.out = StringIO()
+        call_command("archive_events", batch_size=2, stdout=cls.out)
+        cls.list_url = reverse("event-list")
+        cls.start_date = (now - timedelta(days=700)).isoformat()
+
+    def ids(self, response):
+        return [event["id"] for event in response.data["results"]]
+
+    def test_archive_events_command_success(self):
+        archived = [event.id for event in self.events[:3]]
+
+        self.assertIn("Archived 3 event(s)", self.out.getvalue())
+        self.assertFalse(Event.objects.filter(id__in=archived).exists())
+        self.assertEqual(list(ArchivedEvent.objects.order_by("date").values_list("id", flat=True)), archived)
+        self.assertEqual(ArchivedEvent.objects.get(id=self.events[1].id).participant_count, 1)
+        self.assertEqual(ArchivedEvent.objects.get(id=self.events[1].id).seats_left, 9)
+        self.assertEqual(
+            list(ArchivedEventRegistration.objects.values_list("user", "event")),
+            [(self.attendee.id, self.events[1].id)],
+        )
+        self.assertEqual(list(EventRegistration.objects.values_list("event", flat=True)), [self.events[4].id])
+        self.assertFalse(EventTombstone.objects.exists())
+
+    def test_list_without_past_dates_skips_archive_success(self):
+        response = self.client.get(self.list_url)
+
+        self.assertEqual(self.ids(response), [event.id for event in self.events[3:]])
+
+    def test_list_reaching_archive_success(self):
+        response = self.client.get(self.list_url, {"start_date": self.start_date})
+
+        self.assertEqual(self.ids(response), [event.id for event in self.events])
+        self.assertEqual(response.data["results"][0]["title"], "Event -600")
+
+        response = self.client.get(self.list_url, {"end_date": timezone.now().isoformat()})
+
+        self.assertEqual(self.ids(response), [event.id for event in self.events[:4]])
+
+    def test_list_archive_filters_and_ordering_success(self):
+        self.client.force_authenticate(user=self.attendee)
+
+        response = self.client.get(self.list_url, {"start_date": self.start_date, "participated_by_me": "true"})
+
+        self.assertEqual(self.ids(response), [self.events[1].id, self.events[4].id])
+
+        response = self.client.get(self.list_url, {"start_date": self.start_date, "ordering": "-participant_count"})
+
+        self.assertEqual(self.ids(response)[:2], [self.events[1].id, self.events[4].id])
+
+    def test_list_archive_pagination_success(self):
+        response = self.client.get(self.list_url, {"start_date": self.start_date, "page_size": 2})
+        ids = self.ids(response)
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            ids += self.ids(response)
+
+        self.assertEqual(ids, [event.id for event in self.events])
+
+        response = self.client.get(response.data["previous"])
+
+        self.assertEqual(self.ids(response), [event.id for event in self.events[2:4]])
+
+    def test_retrieve_archived_event_success(self):
+        response = self.client.get(reverse("event-detail", kwargs={"pk": self.events[0].id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], "Event -600")
+
+    async def test_retrieve_archived_event_async_success(self):
+        response = await self.async_client.get(reverse("async-event-detail", kwargs={"pk": self.events[0].id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "Event -600")
+        self.assertEqual(response.json()["organizer"], "testuser1")
+
+    def test_update_archived_event_fail(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.patch(reverse("event-detail", kwargs={"pk": self.events[0].id}), {"title": "New"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_list_reaching_archive_success(self):
+        response = await self.async_client.get(reverse("async-event-list"), {"start_date": self.start_date})
+
+        self.assertEqual([event["id"] for event in response.json()["results"]], [event.id for event in self.events])
+
+
+class EventNearAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        now = timezone.now()
+        places = [
+            ("Riga", 56.95, 24.11),
+            ("Riga suburb", 56.99, 24.11),
+            ("Jurmala", 56.97, 23.77),
+            ("Berlin", 52.52, 13.40),
+            ("Online", None, None),
+            ("Fiji", -16.5, 179.99),
+        ]
+        cls.events = {
+            location: Event.objects.create(
+                title=f"Event in {location}",
+                description="Description",
+                date=now + timedelta(days=i + 1),
+                location=location,
+                latitude=latitude,
+                longitude=longitude,
+                organizer=cls.user,
+            )
+            for i, (location, latitude, longitude) in enumerate(places)
+        }
+        cls.list_url = reverse("event-list")
+
+    def locations(self, response):
+        return [event["location"] for event in response.data["results"]]
+
+    def test_geohash_success(self):
+        self.assertEqual(encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(self.events["Riga"].geohash, encode(56.95, 24.11))
+        self.assertIsNone(self.events["Online"].geohash)
+
+        event = self.events["Riga"]
+        event.latitude, event.longitude = 52.52, 13.40
+        event.save()
+        event.refresh_from_db()
+
+        self.assertEqual(event.geohash, self.events["Berlin"].geohash)
+
+    def test_covering_cells_success(self):
+        cells = covering_cells(56.95, 24.11, *extent(56.95, 10))
+
+        self.assertEqual(len(cells), 9)
+        self.assertTrue(all(len(cell) == 4 for cell in cells))
+        self.assertIn(encode(56.95, 24.11, 4), cells)
+        self.assertIsNone(extent(89.99, 10)[1])
+
+    def test_near_success(self):
+        response = self.client.get(self.list_url, {"near": "56.95,24.11", "radius": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.locations(response), ["Riga", "Riga suburb"])
+
+        response = self.client.get(self.list_url, {"near": "56.95,24.11", "radius": 25})
+
+        self.assertEqual(self.locations(response), ["Riga", "Riga suburb", "Jurmala"])
+
+        response = self.client.get(self.list_url, {"near": "56.95,24.11", "radius": 1000})
+
+        self.assertEqual(self.locations(response), ["Riga", "Riga suburb", "Jurmala", "Berlin"])
+
+    def test_near_default_radius_success(self):
+        response = self.client.get(self.list_url, {"near": "56.95,24.11"})
+
+        self.assertEqual(self.locations(response), ["Riga", "Riga suburb"])
+
+    def test_near_across_antimeridian_success(self):
+        response = self.client.get(self.list_url, {"near": "-16.5,-179.99", "radius": 5})
+
+        self.assertEqual(self.locations(response), ["Fiji"])
+
+    def test_near_narrows_by_cell_success(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.list_url, {"near": "56.95,24.11", "radius": 10})
+
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertEqual(sql.count('"geohash" LIKE'), 9)
+
+    def test_near_invalid_fail(self):
+        for params in ({"near": "56.95"}, {"near": "north,east"}, {"near": "91,0"}, {"near": "0,0", "radius": -1}):
+            with self.subTest(params=params):
+                response = self.client.get(self.list_url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_with_coordinates_success(self):
+        self.client.force_authenticate(user=self.user)
+        data = {
+            "title": "New event",
+            "description": "Description",
+            "date": (timezone.now() + timedelta(days=1)).isoformat(),
+            "location": "Riga",
+            "latitude": 56.95,
+            "longitude": 24.11,
+        }
+
+        response = self.client.post(self.list_url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Event.objects.get(id=response.data["id"]).geohash, encode(56.95, 24.11))
+
+    def test_create_with_half_coordinates_fail(self):
+        self.client.force_authenticate(user=self.user)
+        data = {
+            "title": "New event",
+            "description": "Description",
+            "date": (timezone.now() + timedelta(days=1)).isoformat(),
+            "location": "Riga",
+            "latitude": 56.95,
+        }
+
+        response = self.client.post(self.list_url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", response.data["errors"])
+
+
+class EventRecurrenceAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        cls.attendee = User.objects.create_user(username="testuser2", email="test2@example.com", password="testpass123")
+        cls.other = User.objects.create_user(username="testuser3", email="test3@example.com", password="testpass123")
+        cls.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        cls.weekly = Event.objects.create(
+            title="Weekly meetup",
+            description="Description",
+            date=cls.start,
+            location="Riga",
+            organizer=cls.user,
+            capacity=1,
+            recurrence="FREQ=WEEKLY",
+        )
+        cls.daily = Event.objects.create(
+            title="Daily standup",
+            description="Description",
+            date=cls.start + timedelta(hours=1),
+            location="Riga",
+            organizer=cls.other,
+            recurrence="FREQ=DAILY;COUNT=3",
+        )
+        cls.single = Event.objects.create(
+            title="Conference",
+            description="Description",
+            date=cls.start + timedelta(days=2),
+            location="Riga",
+            organizer=cls.user,
+        )
+        cls.url = reverse("event-occurrences")
+        cls.window = {
+            "start_date": cls.start.isoformat(),
+            "end_date": (cls.start + timedelta(days=14)).isoformat(),
+        }
+
+    def register(self, event, occurrence=None, user=None):
+        self.client.force_authenticate(user=user or self.attendee)
+        data = {} if occurrence is None else {"occurrence": occurrence.isoformat()}
+        return self.client.post(reverse("event-register", kwargs={"pk": event.id}), data)
+
+    def test_rule_expansion_success(self):
+        start = datetime(2026, 1, 1, 18, tzinfo=dt_timezone.utc)
+        rule = Rule.parse("FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;COUNT=4")
+
+        self.assertEqual([value.day for value in rule.occurrences(start)], [1, 13, 15, 27])
+        self.assertEqual(rule.last(start).day, 27)
+        monthly = Rule.parse("FREQ=MONTHLY;UNTIL=20260601T000000Z").occurrences(start.replace(day=31))
+        self.assertEqual([value.month for value in monthly], [1, 3, 5])
+
+        daily = Rule.parse("FREQ=DAILY;INTERVAL=3")
+        window = (start + timedelta(days=1000), start + timedelta(days=1010))
+        expected = [value for value in daily.occurrences(start, end=window[1]) if value >= window[0]]
+        self.assertEqual(list(daily.occurrences(start, *window)), expected)
+
+        for value in ("FREQ=YEARLY", "FREQ=DAILY;BYDAY=MO", "FREQ=DAILY;COUNT=2;UNTIL=20260101", "FREQ=DAILY;X=1"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                Rule.parse(value)
+
+    def test_create_recurring_event_success(self):
+        self.client.force_authenticate(user=self.user)
+        data = {
+            "title": "Yoga",
+            "description": "Description",
+            "date": self.start.isoformat(),
+            "location": "Riga",
+            "capacity": 10,
+            "recurrence": "FREQ=DAILY;COUNT=5",
+        }
+
+        response = self.client.post(reverse("event-list"), data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNone(response.data["seats_left"])
+        self.assertEqual(Event.objects.get(id=response.data["id"]).recurrence_end, self.start + timedelta(days=4))
+
+        response = self.client.post(reverse("event-list"), {**data, "recurrence": "FREQ=HOURLY"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("recurrence", response.data["errors"])
+
+    def test_far_until_success(self):
+        self.client.force_authenticate(user=self.user)
+        data = {"title": "Forever", "description": "Description", "date": self.start.isoformat(), "location": "Riga"}
+
+        expanded = []
+        steps = Rule.steps
+
+        def counted_steps(rule, first, begin):
+            for value in steps(rule, first, begin):
+                expanded.append(value)
+                yield value
+
+        for recurrence in ("FREQ=DAILY;UNTIL=99991231", "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR,SA,SU;UNTIL=99991231"):
+            with self.subTest(recurrence=recurrence), patch.object(Rule, "steps", counted_steps):
+                expanded.clear()
+                response = self.client.post(reverse("event-list"), {**data, "recurrence": recurrence})
+
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+                self.assertEqual(response.data["recurrence_end"][:10], "9999-12-30")
+                # Walking the series from its start would step through 2.9 million days, seconds per save.
+                self.assertLess(len(expanded), 100)
+
+    def test_occurrences_success(self):
+        response = self.client.get(self.url, self.window)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        occurrences = [(item["event"]["id"], item["occurrence"]) for item in response.data["results"]]
+        self.assertEqual(len(occurrences), 3 + 3 + 1)
+        self.assertEqual(
+            [event_id for event_id, _ in occurrences[:5]],
+            [self.weekly.id, self.daily.id, self.daily.id, self.single.id, self.daily.id],
+        )
+        self.assertEqual(occurrences[-1][0], self.weekly.id)
+        self.assertIsNone(response.data["next"])
+
+    def test_occurrences_paginated_success(self):
+        response = self.client.get(self.url, {**self.window, "page_size": 3})
+        occurrences = [item["occurrence"] for item in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            occurrences += [item["occurrence"] for item in response.data["results"]]
+
+        expected = self.client.get(self.url, self.window).data["results"]
+        self.assertEqual(occurrences, [item["occurrence"] for item in expected])
+
+    def test_occurrences_filtered_success(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url, {**self.window, "organized_by_me": "true"})
+
+        self.assertEqual({item["event"]["id"] for item in response.data["results"]}, {self.weekly.id, self.single.id})
+
+    def test_occurrences_window_fail(self):
+        response = self.client.get(self.url, {"start_date": self.window["start_date"]})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("end_date", response.data["errors"])
+
+        response = self.client.get(
+            self.url, {**self.window, "end_date": (self.start + timedelta(days=400)).isoformat()}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_occurrences_query_count_success(self):
+        for i in range(30):
+            Event.objects.create(
+                title=f"Series {i}",
+                description="Description",
+                date=self.start - timedelta(days=i),
+                location="Riga",
+                recurrence="FREQ=DAILY",
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {**self.window, "page_size": 100})
+
+        self.assertEqual(len(response.data["results"]), 100)
+        # One-off events, overlapping series and the occurrence registration counts.
+        self.assertEqual(len(queries), 3)
+
+    def test_register_occurrence_success(self):
+        second = self.start + timedelta(weeks=1)
+
+        response = self.register(self.weekly, second)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        registration = EventRegistration.objects.get(event=self.weekly)
+        self.assertEqual(registration.occurrence, second)
+        self.weekly.refresh_from_db()
+        self.assertEqual(self.weekly.participant_count, 1)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+        self.assertEqual(self.register(self.weekly, self.start).status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(self.url, self.window)
+
+        counts = [(item["participant_count"], item["seats_left"]) for item in response.data["results"][:1]]
+        self.assertEqual(counts, [(1, 0)])
+
+    def test_register_occurrence_fail(self):
+        self.register(self.weekly, self.start)
+
+        response = self.register(self.weekly, self.start)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"]["non_field_errors"], "You are already registered for this event.")
+
+        response = self.register(self.weekly, self.start, user=self.other)
+        self.assertEqual(response.data["errors"]["non_field_errors"], "This event is fully booked.")
+
+        response = self.register(self.weekly, self.start + timedelta(days=1))
+        self.assertIn("occurrence", response.data["errors"])
+
+        response = self.register(self.daily, self.start + timedelta(days=3, hours=1))
+        self.assertIn("occurrence", response.data["errors"])
+
+        response = self.register(self.weekly)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("occurrence", response.data["errors"])
+
+        url = reverse("event-register", kwargs={"pk": self.weekly.id})
+        response = self.client.post(url, {"occurrence": "next tuesday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("occurrence", response.data["errors"])
+
+        response = self.register(self.single, self.single.date)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.register(self.weekly, self.start, user=self.user)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_archive_finished_series_only_success(self):
+        past = timezone.now() - timedelta(days=800)
+        finished, ongoing = (
+            Event.objects.create(
+                title="Old series", description="Description", date=past, location="Riga", recurrence=recurrence
+            )
+            for recurrence in ("FREQ=WEEKLY;COUNT=10", "FREQ=WEEKLY")
+        )
+
+        call_command("archive_events", stdout=StringIO())
+
+        self.assertTrue(ArchivedEvent.objects.filter(id=finished.id).exists())
+        self.assertTrue(Event.objects.filter(id=ongoing.id).exists())
+
+    def test_reschedule_with_registrations_fail(self):
+        self.register(self.weekly, self.start)
+        self.client.force_authenticate(user=self.user)
+        url = reverse("event-detail", kwargs={"pk": self.weekly.id})
+
+        response = self.client.patch(url, {"recurrence": "FREQ=DAILY"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(url, {"title": "Renamed", "capacity": 5})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["seats_left"])
+
+
+class EventSeedingTestCase(APITestCase):
+
+    def test_seed_events_command_success(self):
+        out = StringIO()
+        call_command("seed_events", users=30, events=60, registrations=300, batch_size=25, stdout=out)
+
+        self.assertIn("Created 30 user(s), 60 event(s)", out.getvalue())
+        self.assertEqual(User.objects.count(), 30)
+        self.assertEqual(Event.objects.count(), 60)
+        registrations = EventRegistration.objects.count()
+        self.assertGreater(registrations, 200)
+        self.assertEqual(sum(Event.objects.values_list("participant_count", flat=True)), registrations)
+        self.assertTrue(Event.objects.filter(date__lt=timezone.now()).exists())
+        self.assertTrue(Event.objects.filter(date__gt=timezone.now()).exists())
+        self.assertFalse(EventRegistration.objects.filter(event__organizer=F("user")).exists())
+        self.assertFalse(Event.objects.filter(participant_count__gt=F("capacity")).exists())
+        self.assertTrue(User.objects.first().check_password("password"))
+
+    def test_seed_deterministic_success(self):
+        Seeder(seed=7).seed(users=10, events=20, registrations=50)
+        first = list(Event.objects.order_by("id").values_list("title", "location", "participant_count"))
+        Event.objects.all().delete()
+        User.objects.all().delete()
+
+        Seeder(seed=7).seed(users=10, events=20, registrations=50)
+        second = list(Event.objects.order_by("id").values_list("title", "location", "participant_count"))
+
+        self.assertEqual([row[1:] for row in first], [row[1:] for row in second])
+
+
+class EventBenchmarkTestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Seeder(batch_size=30).seed(users=20, events=50, registrations=200)
+        cls.context = benchmark.Context(random.Random(0), 10)
+
+    def test_measure_scenarios_success(self):
+        for name, scenario in benchmark.SCENARIOS.items():
+            with self.subTest(name):
+                result = benchmark.measure(scenario, self.context, requests=5, warmup=1)
+
+                self.assertEqual(result["errors"], 0)
+                self.assertLessEqual(result["p50"], result["p95"])
+                self.assertLessEqual(result["p95"], result["p99"])
+                self.assertGreater(result["throughput"], 0)
+
+    def test_measure_throttled_fail(self):
+        cache.clear()
+        client = self.context.clients[0]
+        url = reverse("event-register", kwargs={"pk": self.context.open_event.pk})
+        rates = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {"register": "1/min"}}
+        with override_settings(REST_FRAMEWORK=rates):
+            result = benchmark.measure(lambda context: client.post(url), self.context, requests=3)
+
+        self.assertEqual(result["errors"], 2)
+
+    def test_unthrottled_success(self):
+        with benchmark.unthrottled():
+            self.assertIsNone(RegisterRateThrottle().rate)
+        self.assertIsNotNone(RegisterRateThrottle().rate)
+
+    def test_compare_success(self):
+        baseline = {"list": {"p50": 10, "p95": 20, "p99": 30, "queries": 3}}
+        results = {
+            "list": {"p50": 11, "p95": 26, "p99": 30, "queries": 4, "errors": 0},
+            "detail": {"p50": 100, "p95": 100, "p99": 100, "queries": 9, "errors": 0},
+        }
+
+        regressions = benchmark.compare(results, baseline, threshold=0.25)
+
+        self.assertEqual(regressions, ["list: p95 26.00ms > 25.00ms", "list: 4 queries > 3"])
+
+
+class EventCapacityStressTest(TransactionTestCase):
+    capacity = 5
+    clients = 30
+
+    def setUp(self):
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            self.skipTest("Parallel writers need a database shared between connections")
+
+        organizer = User.objects.create_user(username="organizer", email="org@example.com", password="testpass123")
+        self.users = [
+            User(username=f"user{i}", email=f"user{i}@example.com", password="!") for i in range(self.clients)
+        ]
+        User.objects.bulk_create(self.users)
+        self.users = list(User.objects.exclude(pk=organizer.pk))
+        self.event = Event.objects.create(
+            title="Ticket Drop",
+            description="Hot event",
+            date=timezone.now() + timedelta(days=1),
+            location="Online",
+            organizer=organizer,
+            capacity=self.capacity,
+            seats_left=self.capacity,
+        )
+
+    def register(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        try:
+            return client.post(reverse("event-register", kwargs={"pk": self.event.id})).status_code
+        finally:
+            connections.close_all()
+
+    def test_parallel_registrations_never_overbook_success(self):
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            statuses = list(executor.map(self.register, self.users))
+
+        self.event.refresh_from_db()
+        registrations = self.event.eventregistration_set.count()
+
+        self.assertEqual(statuses.count(status.HTTP_201_CREATED), self.capacity)
+        self.assertEqual(statuses.count(status.HTTP_400_BAD_REQUEST), self.clients - self.capacity)
+        self.assertEqual(registrations, self.capacity)
+        self.assertEqual(self.event.seats_left, 0)
+        self.assertEqual(self.event.participant_count, self.capacity)
+
+
+class EventResponseCacheTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        self.event = Event.objects.create(
+            title="Cached Event",
+            description="Description",
+            date=timezone.now() + timedelta(days=1),
+            location="Oslo",
+            organizer=self.user,
+        )
+        self.client = APIClient()
+        self.list_url = reverse("event-list")
+        self.detail_url = reverse("event-detail", kwargs={"pk": self.event.id})
+
+    def test_anonymous_list_cached_success(self):
+        first = self.client.get(self.list_url + "?search=oslo&page_size=5")
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.list_url + "?page_size=5&search=oslo")
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(len(queries), 0)
+
+    def test_write_invalidates_list_and_detail_success(self):
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+
+        attendee = User.objects.create_user(username="testuser2", email="test2@example.com", password="testpass123")
+        EventRegistration.objects.create(user=attendee, event=self.event)
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["participant_count"], 1)
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["participant_count"], 1)
+
+        self.event.delete()
+
+        self.assertEqual(self.client.get(self.list_url).data["results"], [])
+        self.assertEqual(self.client.get(self.detail_url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_register_invalidates_detail_success(self):
+        self.client.get(self.detail_url)
+        attendee = User.objects.create_user(username="testuser2", email="test2@example.com", password="testpass123")
+        client = APIClient()
+        client.force_authenticate(user=attendee)
+        client.post(reverse("event-register", kwargs={"pk": self.event.id}))
+
+        response = self.client.get(self.detail_url)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["participant_count"], 1)
+
+    def test_cached_not_modified_success(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(queries), 0)
+
+    def test_organizer_rename_invalidates_success(self):
+        self.client.get(self.list_url)
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        self.user.username = "renamed"
+        self.user.save()
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["organizer"], "renamed")
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["organizer"], "renamed")
+
+    def test_authenticated_not_cached_success(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url)
+
+        self.assertNotIn("X-Cache", response)
+
+    def test_cache_stats_success(self):
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+
+        self.client.force_authenticate(user=User.objects.create_superuser("admin", "admin@example.com", "pass"))
+        response = self.client.get(reverse("event-cache-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"hits": 2, "misses": 1, "hit_rate": 2 / 3})
+
+    def test_cache_stats_non_admin_fail(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("event-cache-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class EventFeedAPITest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser1", email="test1@example.com", password="testpass123")
+        self.organizer = User.objects.create_user(
+            username="testuser2", email="test2@example.com", password="testpass123"
+        )
+        self.event = Event.objects.create(
+            title="Concert, live",
+            description="Description",
+            date=timezone.now() + timedelta(days=1),
+            location="Oslo",
+            latitude=59.91,
+            longitude=10.75,
+            organizer=self.organizer,
+        )
+        self.series = Event.objects.create(
+            title="Weekly meetup",
+            description="Description",
+            date=timezone.now() + timedelta(days=2),
+            location="Riga",
+            organizer=self.user,
+            recurrence="FREQ=WEEKLY;COUNT=4",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        urls = self.client.get(reverse("event-feeds")).data
+        self.participating_url, self.organized_url = urls["participating"], urls["organized"]
+        self.client.force_authenticate(user=None)
+
+    def register(self, event):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        return client.post(reverse("event-register", kwargs={"pk": event.id}))
+
+    def test_feed_urls_success(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("event-feeds"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["participating"], self.participating_url)
+        self.assertRegex(self.organized_url, r"^http://testserver/api/events/events/feeds/[\w-]{43}/organized\.ics$")
+
+    def test_feed_urls_unauthenticated_fail(self):
+        response = self.client.get(reverse("event-feeds"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_feed_content_success(self):
+        self.register(self.event)
+
+        participating = self.client.get(self.participating_url)
+        organized = self.client.get(self.organized_url).content.decode()
+
+        self.assertEqual(participating.status_code, status.HTTP_200_OK)
+        self.assertEqual(participating["Content-Type"], "text/calendar; charset=utf-8")
+        body = participating.content.decode()
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertIn(f"UID:event-{self.event.id}@event-management\r\n", body)
+        self.assertIn("SUMMARY:Concert\\, live\r\n", body)
+        self.assertIn("GEO:59.91;10.75\r\n", body)
+        self.assertNotIn("Weekly meetup", body)
+        self.assertIn("RRULE:FREQ=WEEKLY;COUNT=4\r\n", organized)
+        self.assertNotIn("Concert", organized)
+
+    def test_feed_cached_success(self):
+        first = self.client.get(self.organized_url)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.organized_url)
+
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(len(queries), 0)
+
+    def test_feed_not_modified_success(self):
+        etag = self.client.get(self.organized_url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.organized_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(len(queries), 0)
+
+    def test_register_invalidates_feed_success(self):
+        etag = self.client.get(self.participating_url)["ETag"]
+        self.register(self.event)
+
+        response = self.client.get(self.participating_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Concert", response.content.decode())
+
+    def test_event_change_invalidates_feed_success(self):
+        self.register(self.event)
+        self.client.get(self.participating_url)
+        self.event.title = "Renamed concert"
+        self.event.save()
+
+        response = self.client.get(self.participating_url)
+
+        self.assertIn("SUMMARY:Renamed concert", response.content.decode())
+
+    def test_new_organized_event_invalidates_feed_success(self):
+        self.client.get(self.organized_url)
+        Event.objects.create(
+            title="Workshop", description="Description", date=timezone.now(), location="Riga", organizer=self.user
+        )
+
+        response = self.client.get(self.organized_url)
+
+        self.assertIn("SUMMARY:Workshop", response.content.decode())
+
+    def test_rotate_feed_success(self):
+        self.client.get(self.organized_url)
+        self.client.force_authenticate(user=self.user)
+        urls = self.client.post(reverse("event-feeds")).data
+
+        self.assertNotEqual(urls["organized"], self.organized_url)
+        self.assertEqual(self.client.get(self.organized_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(urls["organized"]).status_code, status.HTTP_200_OK)
+
+    def test_unknown_token_fail(self):
+        response = self.client.get(reverse("event-feed", kwargs={"token": "unknown", "kind": "organized"}))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_fold_long_lines_success(self):
+        line = "DESCRIPTION:" + "ä" * 100
+        folded = fold(line)
+
+        self.assertTrue(all(len(part.encode()) <= 75 for part in folded.split("\r\n")))
+        self.assertEqual(folded.replace("\r\n ", ""), line)
+
+
+@override_settings(EVENT_STREAM_INTERVAL=0.05, EVENT_STREAM_KEEPALIVE=0.5)
+class EventStreamTest(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(
+            username="testuser1", email="test1@example.com", password="testpass123"
+        )
+        self.users = User.objects.bulk_create(
+            User(username=f"attendee{i}", email=f"attendee{i}@example.com", password="!") for i in range(20)
+        )
+        self.event = Event.objects.create(
+            title="Ticket drop",
+            description="Description",
+            date=timezone.now() + timedelta(days=1),
+            location="Riga",
+            organizer=self.organizer,
+            capacity=100,
+            seats_left=100,
+        )
+        self.url = reverse("async-event-stream", kwargs={"pk": self.event.id})
+
+    @staticmethod
+    def parse(chunk):
+        lines = chunk.decode().strip().split("\n")
+        fields = dict(line.split(": ", 1) for line in lines if not line.startswith(("retry", ":")))
+        return fields["event"], json.loads(fields["data"])
+
+    def register_all(self):
+        client = APIClient()
+        for user in self.users:
+            client.force_authenticate(user=user)
+            client.post(reverse("event-register", kwargs={"pk": self.event.id}))
+
+    async def test_stream_snapshot_success(self):
+        response = await self.async_client.get(self.url)
+        chunks = aiter(response.streaming_content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        first = await anext(chunks)
+        self.assertTrue(first.startswith(b"retry: 3000\n"))
+        name, data = self.parse(first)
+        self.assertEqual(name, "update")
+        self.assertEqual((data["id"], data["participant_count"], data["seats_left"]), (self.event.id, 0, 100))
+        self.assertEqual(await anext(chunks), b": keepalive\n\n")
+        await chunks.aclose()
+
+    async def test_stream_coalesces_registrations_success(self):
+        response = await self.async_client.get(self.url)
+        chunks = aiter(response.streaming_content)
+        await anext(chunks)
+
+        with patch("events.live.EventSerializer", wraps=EventSerializer) as serializer:
+            await sync_to_async(self.register_all)()
+            name, data = self.parse(await anext(chunks))
+            # Later notifications of the burst find the snapshot unchanged and send nothing.
+            keepalive = await anext(chunks)
+
+        self.assertEqual(name, "update")
+        self.assertEqual((data["participant_count"], data["seats_left"]), (20, 80))
+        self.assertEqual(keepalive, b": keepalive\n\n")
+        self.assertEqual(serializer.call_count, 1)
+        await chunks.aclose()
+
+    async def test_stream_edit_and_delete_success(self):
+        response = await self.async_client.get(self.url)
+        chunks = aiter(response.streaming_content)
+        await anext(chunks)
+
+        self.event.title = "Ticket drop, second wave"
+        await self.event.asave()
+        name, data = self.parse(await anext(chunks))
+
+        self.assertEqual((name, data["title"]), ("update", "Ticket drop, second wave"))
+
+        event_id = self.event.id
+        await self.event.adelete()
+        name, data = self.parse(await anext(chunks))
+
+        self.assertEqual((name, data), ("delete", {"id": event_id}))
+        with self.assertRaises(StopAsyncIteration):
+            await anext(chunks)
+        self.assertNotIn(event_id, get_broker().subscriptions)
+
+    async def open_stream(self, application):
+        requested, closed, started = asyncio.Queue(), asyncio.Event(), asyncio.Event()
+        await requested.put({"type": "http.request", "body": b"", "more_body": False})
+
+        async def receive():
+            if not requested.empty():
+                return await requested.get()
+            await closed.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                started.set()
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": self.url,
+            "query_string": b"",
+            "headers": [(b"host", b"testserver")],
+            "asgi": {"version": "3.0"},
+        }
+        task = asyncio.create_task(application(scope, receive, send))
+        await asyncio.wait_for(started.wait(), 5)
+        return task, closed
+
+    async def count_stream_threads(self, application, count):
+        streams = [await self.open_stream(application)]
+        before = threading.active_count()
+        streams += [await self.open_stream(application) for _ in range(count - 1)]
+        after = threading.active_count()
+        for task, closed in streams:
+            closed.set()
+            task.cancel()
+        await asyncio.gather(*(task for task, _ in streams), return_exceptions=True)
+        return after - before
+
+    def test_stream_threads_success(self):
+        # Run outside the test's own async_to_sync, which would take every thread-sensitive call on this thread.
+        added = asyncio.run(self.count_stream_threads(StreamingASGIHandler(), 30))
+
+        # Snapshots are read on the shared executor; the streams themselves hold no thread.
+        self.assertLessEqual(added, settings.EVENT_STREAM_READ_THREADS)
+
+    def test_stream_wsgi_fail(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertEqual(response.json(), {"message": "Live updates are only served over ASGI."})
+
+    @skipUnless(connection.vendor == "postgresql", "NOTIFY requires PostgreSQL")
+    async def test_postgres_broker_success(self):
+        broker = PostgresBroker()
+        subscription = broker.subscribe(self.event.id)
+        self.assertTrue(await sync_to_async(broker.ready.wait, thread_sensitive=False)(5))
+        # The listener wakes every subscriber once it is connected.
+        self.assertTrue(await subscription.wait(5))
+
+        await sync_to_async(broker.publish)(self.event.id)
+
+        self.assertTrue(await subscription.wait(5))
+        subscription.close()
+
+    async def test_stream_not_found_fail(self):
+        for pk in (0, "abc"):
+            response = await self.async_client.get(reverse("async-event-stream", kwargs={"pk": pk}))
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(dict(get_broker().subscriptions), {})
+
+    async def test_broker_coalesces_notifications_success(self):
+        subscription = InProcessBroker().subscribe(self.event.id)
+        for _ in range(1000):
+            await sync_to_async(subscription.broker.publish, thread_sensitive=False)(self.event.id)
+
+        self.assertTrue(await subscription.wait(1))
+        self.assertFalse(await subscription.wait(0.05))
+        subscription.close()
+        self.assertEqual(dict(subscription.broker.subscriptions), {})
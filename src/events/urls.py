@@ -1,8 +1,14 @@
+from django.urls import re_path
 from rest_framework.routers import DefaultRouter
 
+from events.feeds import calendar_feed
 from events.views import EventViewSet
 
 router = DefaultRouter()
 router.register(r"events", EventViewSet, basename="event")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    re_path(
+        r"^events/feeds/(?P<token>[\w-]+)/(?P<kind>participating|organized)\.ics$", calendar_feed, name="event-feed"
+    ),
+]
@@ -1,22 +1,69 @@
+import base64
+import binascii
+import json
+from datetime import timedelta
+from functools import partial
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count
+from django.http import Http404
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, viewsets
+from django_filters.utils import translate_validation
+from rest_framework import filters, serializers, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
-from events.filters import EventFilter
-from events.models import Event
-from events.permissions import IsNotOrganizer, IsOrganizerOrReadOnly
+from event_management.routers import is_pinned, use_replicas
+from event_management.throttling import RegisterRateThrottle
+from events.archive import reaches_archive
+from events.cache import (
+    GENERATION_KEY,
+    LIST_VERSION_KEY,
+    cached_response,
+    event_version_key,
+    get_stats,
+    invalidate_event,
+    invalidate_user_feeds,
+)
+from events.conditional import make_etag
+from events.export import stream_export
+from events.feeds import FEED_KINDS, get_feed, rotate_feed
+from events.filters import EventFilter, OccurrenceFilter
+from events.live import publish_event
+from events.models import ArchivedEvent, Event, EventRegistration
+from events.pagination import KeysetPagination
+from events.permissions import IsOrganizer, IsOrganizerOrReadOnly
+from events.recurrence import expand, parse_rule
+from events.search import EventSearchFilter
 from events.serializers import EventRegistrationSerializer, EventSerializer
+from events.sync import get_changes
+from notifications.models import OutboxEmail
 
 
 class EventViewSet(viewsets.ModelViewSet):
-    queryset = Event.objects.all().order_by("date")
+    queryset = Event.objects.select_related("organizer").defer("search_vector").order_by("date")
     serializer_class = EventSerializer
+    pagination_class = KeysetPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
+    filter_backends = [EventSearchFilter, DjangoFilterBackend, filters.OrderingFilter]
     search_fields = ["title", "location", "organizer__username"]
+    ordering_fields = ["date", "participant_count"]
     filterset_class = EventFilter
+    max_occurrence_window = timedelta(days=366)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Delta sync stays on the primary: a lagging replica would hand out a cursor past writes it has not applied
+        # yet, and the client would never see them. EVENT_SYNC_LAG only covers commit order on one database.
+        if request.method in SAFE_METHODS and self.action != "changes" and not is_pinned(request.user):
+            use_replicas()
 
     def get_filterset(self, *args, **kwargs):
         kwargs["request"] = self.request
@@ -25,22 +72,290 @@ class EventViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         if self.action in ("update", "partial_update", "destroy"):
             return [IsAuthenticated(), IsOrganizerOrReadOnly()]
+        if self.action == "export_registrations":
+            return [IsAuthenticated(), IsOrganizer()]
         if self.action == "register":
-            return [IsAuthenticated(), IsNotOrganizer()]
+            return [IsAuthenticated()]
         return super().get_permissions()
 
+    def get_archived_queryset(self):
+        """
+        Return the archived events matching the list request, or ``None`` when its dates stay clear of the archive.
+
+        The archive gets the same search, filters and ordering as the hot table so the two merge into one keyset.
+        """
+        queryset = ArchivedEvent.objects.select_related("organizer").defer("search_vector").order_by("date")
+        filterset = EventFilter(self.request.query_params, queryset, request=self.request)
+        if not filterset.is_valid():
+            return None
+        if not reaches_archive(filterset.form.cleaned_data["start_date"], filterset.form.cleaned_data["end_date"]):
+            return None
+        queryset = EventSearchFilter().filter_queryset(self.request, filterset.qs, self)
+        return filters.OrderingFilter().filter_queryset(self.request, queryset, self)
+
+    def get_list_querysets(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        archived = self.get_archived_queryset()
+        return [queryset] if archived is None else [queryset, archived]
+
+    def paginate_queryset(self, queryset):
+        archived = self.get_archived_queryset() if self.action == "list" else None
+        if archived is None:
+            return super().paginate_queryset(queryset)
+        return self.paginator.paginate_querysets([queryset, archived], self.request, view=self)
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            # Archived events stay readable at their old URL, but no longer change.
+            if self.action != "retrieve":
+                raise
+            queryset = ArchivedEvent.objects.select_related("organizer").defer("search_vector")
+            return get_object_or_404(queryset, pk=self.kwargs["pk"])
+
+    def list(self, request, *args, **kwargs):
+        render = partial(super().list, request, *args, **kwargs)
+        return cached_response(request, [GENERATION_KEY, LIST_VERSION_KEY], self.get_list_validators, render)
+
+    def retrieve(self, request, *args, **kwargs):
+        render = partial(super().retrieve, request, *args, **kwargs)
+        try:
+            event_id = Event._meta.pk.to_python(kwargs["pk"])
+        except DjangoValidationError:
+            return render()
+        validators = partial(self.get_detail_validators, event_id)
+        return cached_response(request, [GENERATION_KEY, event_version_key(event_id)], validators, render)
+
+    def get_list_validators(self):
+        # The ETag covers the (id, updated_at) pairs of the requested page window, so a poll that would get the same
+        # page back costs one narrow read and no serialization, while a row leaving the window or sliding into it
+        # changes the ETag. Every change to an ordering field bumps updated_at, so the pairs also pin the order.
+        # A newest updated_at cannot tell that a row left the page, so lists carry no Last-Modified.
+        # Archiving moves rows without changing them, so a page served across both tables keeps its validators.
+        rows = set()
+        for queryset in self.get_list_querysets():
+            page = self.paginator.get_page_queryset(queryset, self.request, self)
+            rows.update((queryset if page is None else page).values_list("id", "updated_at"))
+        return make_etag(self.request, sorted(rows)), None
+
+    def get_detail_validators(self, event_id):
+        for model in (Event, ArchivedEvent):
+            state = model.objects.filter(pk=event_id).values("updated_at", "participant_count", "seats_left").first()
+            if state is not None:
+                return make_etag(self.request, *state.values()), state["updated_at"]
+        return None
+
     def perform_create(self, serializer):
         serializer.save(organizer=self.request.user)
 
-    @action(detail=True, methods=["post"], serializer_class=EventRegistrationSerializer)
-    def register(self, request, pk=None):
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        changes = get_changes(
+            self.get_queryset(), request.query_params.get("since"), self.paginator.get_page_size(request)
+        )
+        changes["changed"] = self.get_serializer(changes["changed"], many=True).data
+        return Response(changes)
+
+    @action(detail=False, methods=["get"])
+    def occurrences(self, request):
+        queryset = EventSearchFilter().filter_queryset(request, self.get_queryset(), self)
+        filterset = OccurrenceFilter(request.query_params, queryset, request=request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        start, end = filterset.form.cleaned_data["start_date"], filterset.form.cleaned_data["end_date"]
+        if end - start > self.max_occurrence_window:
+            raise ValidationError({"end_date": f"The window cannot exceed {self.max_occurrence_window.days} days."})
+
+        page_size = self.paginator.get_page_size(request)
+        after = self.decode_occurrence_cursor(request.query_params.get(self.paginator.cursor_query_param))
+        occurrences = expand(filterset.qs, start, end, after, page_size + 1)
+        next_link = None
+        if len(occurrences) > page_size:
+            occurrences = occurrences[:page_size]
+            next_link = self.encode_occurrence_cursor(*occurrences[-1])
+
+        taken = self.count_occurrence_registrations(
+            [(value, event) for value, event in occurrences if event.recurrence]
+        )
+        # A series shows up once per occurrence but is serialized once.
+        unique = list({event.id: event for _, event in occurrences}.values())
+        events = {event.id: data for event, data in zip(unique, self.get_serializer(unique, many=True).data)}
+        results = []
+        for value, event in occurrences:
+            if event.recurrence:
+                count = taken.get((event.id, value), 0)
+                seats_left = None if event.capacity is None else max(event.capacity - count, 0)
+            else:
+                count, seats_left = event.participant_count, event.seats_left
+            results.append(
+                {
+                    "occurrence": serializers.DateTimeField().to_representation(value),
+                    "participant_count": count,
+                    "seats_left": seats_left,
+                    "event": events[event.id],
+                }
+            )
+        return Response({"next": next_link, "results": results})
+
+    def count_occurrence_registrations(self, occurrences):
+        # One grouped query counts the attendees of every series occurrence on the page.
+        if not occurrences:
+            return {}
+        counts = (
+            EventRegistration.objects.filter(
+                event_id__in={event.id for _, event in occurrences},
+                occurrence__in={value for value, _ in occurrences},
+            )
+            .order_by()
+            .values("event_id", "occurrence")
+            .annotate(count=Count("id"))
+        )
+        return {(row["event_id"], row["occurrence"]): row["count"] for row in counts}
+
+    def encode_occurrence_cursor(self, occurrence, event):
+        tokens = {"o": occurrence.isoformat(), "i": event.id}
+        encoded = base64.urlsafe_b64encode(json.dumps(tokens, separators=(",", ":")).encode()).decode("ascii")
+        return replace_query_param(self.request.build_absolute_uri(), self.paginator.cursor_query_param, encoded)
+
+    def decode_occurrence_cursor(self, value):
+        if value is None:
+            return None
+        try:
+            tokens = json.loads(base64.urlsafe_b64decode(value.encode("ascii")))
+            occurrence = parse_datetime(tokens["o"])
+            if occurrence is None:
+                raise ValueError
+            return occurrence, int(tokens["i"])
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+            raise ValidationError({self.paginator.cursor_query_param: "Invalid cursor."})
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
+    def export(self, request):
+        fields = {
+            "id": "id",
+            "title": "title",
+            "description": "description",
+            "date": "date",
+            "location": "location",
+            "organizer": "organizer__username",
+            "capacity": "capacity",
+            "seats_left": "seats_left",
+            "participant_count": "participant_count",
+        }
+        queryset = self.filter_queryset(self.get_queryset())
+        return stream_export(request, queryset, fields, "events", request.query_params.get("output", "csv"))
+
+    @action(detail=True, methods=["get"], url_path="registrations/export")
+    def export_registrations(self, request, pk=None):
         event = self.get_object()
+        fields = {
+            "id": "user_id",
+            "username": "user__username",
+            "email": "user__email",
+            "first_name": "user__first_name",
+            "last_name": "user__last_name",
+            "occurrence": "occurrence",
+        }
+        queryset = EventRegistration.objects.filter(event=event).order_by("id")
+        filename = f"event-{event.pk}-registrations"
+        return stream_export(request, queryset, fields, filename, request.query_params.get("output", "csv"))
+
+    @action(detail=False, methods=["get", "post"], permission_classes=[IsAuthenticated])
+    def feeds(self, request):
+        # POST replaces the token, for when a feed URL leaked.
+        feed = rotate_feed(request.user) if request.method == "POST" else get_feed(request.user)
+        urls = {
+            kind: request.build_absolute_uri(reverse("event-feed", kwargs={"token": feed.token, "kind": kind}))
+            for kind in FEED_KINDS
+        }
+        return Response(urls)
+
+    @action(detail=False, methods=["get"], url_path="cache-stats", permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        return Response(get_stats())
 
-        serializer = self.get_serializer(data={}, context={"request": request, "event": event})
+    @action(
+        detail=True,
+        methods=["post"],
+        serializer_class=EventRegistrationSerializer,
+        throttle_classes=[RegisterRateThrottle],
+    )
+    def register(self, request, pk=None):
+        try:
+            event_id = Event._meta.pk.to_python(pk)
+        except DjangoValidationError:
+            self.raise_registration_error(None)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        super().perform_create(serializer)
+        occurrence = serializer.validated_data.get("occurrence")
+        if occurrence is not None:
+            return self.register_occurrence(event_id, occurrence)
 
-        request.user.email_user(
-            subject="Event Registration", message=f"You have successfully registered for the {event.title} event"
-        )
+        # The confirmation is queued in the same transaction and delivered by the send_outbox worker.
+        with transaction.atomic():
+            registered = EventRegistration.objects.register(request.user, event_id)
+            if registered is not None:
+                OutboxEmail.objects.create(
+                    recipient=request.user.email,
+                    subject="Event Registration",
+                    body=f"You have successfully registered for the {registered[1]} event",
+                )
+                # Counted last so the event row stays locked only until the commit.
+                if not Event.objects.add_participant(event_id):
+                    transaction.set_rollback(True)
+                    registered = None
+                else:
+                    invalidate_event(event_id)
+                    publish_event(event_id)
+                    invalidate_user_feeds(request.user.pk)
+
+        if registered is None:
+            self.raise_registration_error(event_id)
+        return Response({"detail": "Registration successful."}, status=status.HTTP_201_CREATED)
+
+    def register_occurrence(self, event_id, occurrence):
+        with transaction.atomic():
+            # The series row lock serializes its registrations, so counting the taken seats cannot race.
+            event = (
+                Event.objects.select_for_update()
+                .only("title", "date", "organizer_id", "capacity", "recurrence", "recurrence_end")
+                .filter(pk=event_id)
+                .first()
+            )
+            if event is None:
+                raise Http404(f"No {Event._meta.object_name} matches the given query.")
+            if event.organizer_id == self.request.user.pk:
+                self.permission_denied(self.request)
+            if not event.recurrence:
+                raise ValidationError({"occurrence": ["This event does not recur."]})
+            if not parse_rule(event.recurrence).includes(event.date, occurrence, event.recurrence_end):
+                raise ValidationError({"occurrence": ["The event does not take place at this time."]})
+
+            registrations = EventRegistration.objects.filter(event_id=event_id, occurrence=occurrence)
+            if registrations.filter(user=self.request.user).exists():
+                raise ValidationError({"non_field_errors": ["You are already registered for this event."]})
+            if event.capacity is not None and registrations.count() >= event.capacity:
+                raise ValidationError({"non_field_errors": ["This event is fully booked."]})
+
+            # The post_save signal counts the participant.
+            EventRegistration.objects.create(user=self.request.user, event_id=event_id, occurrence=occurrence)
+            OutboxEmail.objects.create(
+                recipient=self.request.user.email,
+                subject="Event Registration",
+                body=f"You have successfully registered for the {event.title} event on {occurrence:%Y-%m-%d %H:%M}",
+            )
         return Response({"detail": "Registration successful."}, status=status.HTTP_201_CREATED)
+
+    def raise_registration_error(self, event_id):
+        events = Event.objects.filter(pk=event_id).values_list("organizer_id", "seats_left", "recurrence")[:1]
+        if not events:
+            raise Http404(f"No {Event._meta.object_name} matches the given query.")
+        organizer_id, seats_left, recurrence = events[0]
+        if organizer_id == self.request.user.pk:
+            self.permission_denied(self.request)
+        if recurrence:
+            raise ValidationError({"occurrence": ["This field is required for recurring events."]})
+        if seats_left == 0 and not EventRegistration.objects.filter(event_id=event_id, user=self.request.user).exists():
+            raise ValidationError({"non_field_errors": ["This event is fully booked."]})
+        raise ValidationError({"non_field_errors": ["You are already registered for this event."]})
@@ -0,0 +1,16 @@
+from django.contrib import admin
+
+from notifications.models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("id", "recipient", "subject", "status", "attempts", "available_at", "sent_at")
+
+    list_filter = ("status",)
+
+    search_fields = ("recipient", "subject")
+
+    readonly_fields = ("created_at", "sent_at", "last_error")
+
+    ordering = ("-id",)
@@ -0,0 +1,69 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the outbox over a single reused mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Emails claimed per transaction.")
+        parser.add_argument("--poll-interval", type=float, default=5.0, help="Seconds to sleep when idle.")
+        parser.add_argument("--max-attempts", type=int, default=5, help="Attempts before an email is failed.")
+        parser.add_argument("--backoff", type=float, default=30.0, help="Base retry delay in seconds, doubled per attempt.")
+        parser.add_argument("--once", action="store_true", help="Drain the ready emails and exit.")
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        try:
+            while True:
+                claimed = self.send_batch(connection, options["batch_size"], options["max_attempts"], options["backoff"])
+                if claimed < options["batch_size"]:
+                    if options["once"]:
+                        break
+                    connection.close()
+                    time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+
+    def send_batch(self, connection, batch_size, max_attempts, backoff):
+        with transaction.atomic():
+            # SKIP LOCKED lets any number of workers drain the outbox concurrently without handing out a row twice.
+            batch = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboxEmail.Status.PENDING, available_at__lte=timezone.now())
+                .order_by("available_at", "id")[:batch_size]
+            )
+
+            for email in batch:
+                email.attempts += 1
+                try:
+                    # An explicitly opened connection is kept alive by the backend across messages and batches.
+                    connection.open()
+                    EmailMessage(email.subject, email.body, to=[email.recipient], connection=connection).send()
+                except Exception as exc:
+                    # Drop a possibly broken session, the next send opens a fresh one.
+                    connection.close()
+                    email.last_error = str(exc)
+                    if email.attempts >= max_attempts:
+                        email.status = OutboxEmail.Status.FAILED
+                    else:
+                        email.available_at = timezone.now() + timedelta(seconds=backoff * 2 ** (email.attempts - 1))
+                    self.stderr.write(f"Failed to send outbox email {email.pk}: {exc}")
+                else:
+                    email.status = OutboxEmail.Status.SENT
+                    email.sent_at = timezone.now()
+
+            OutboxEmail.objects.bulk_update(batch, ["status", "attempts", "available_at", "last_error", "sent_at"])
+
+        if batch:
+            self.stdout.write(f"Processed {len(batch)} outbox email(s).")
+        return len(batch)
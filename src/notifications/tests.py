@@ -0,0 +1,74 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPException
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from notifications.models import OutboxEmail
+
+
+class SendOutboxCommandTest(TestCase):
+
+    def send_outbox(self, *args):
+        call_command("send_outbox", "--once", *args, stdout=StringIO(), stderr=StringIO())
+
+    def create_email(self, **kwargs):
+        return OutboxEmail.objects.create(
+            recipient="test@example.com", subject="Event Registration", body="Registered", **kwargs
+        )
+
+    def test_send_pending_emails_success(self):
+        emails = [self.create_email() for _ in range(3)]
+
+        self.send_outbox("--batch-size", "2")
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].to, ["test@example.com"])
+        for email in emails:
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboxEmail.Status.SENT)
+            self.assertEqual(email.attempts, 1)
+            self.assertIsNotNone(email.sent_at)
+
+    def test_skip_sent_and_delayed_emails_success(self):
+        self.create_email(status=OutboxEmail.Status.SENT)
+        self.create_email(available_at=timezone.now() + timedelta(minutes=5))
+
+        self.send_outbox()
+
+        self.assertEqual(len(mail.outbox), 0)
+
+    @patch.object(EmailMessage, "send", side_effect=SMTPException("Connection unexpectedly closed"))
+    def test_retry_with_backoff_fail(self, mock_send):
+        email = self.create_email()
+
+        before = timezone.now()
+        self.send_outbox("--backoff", "10")
+        email.refresh_from_db()
+
+        self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.last_error, "Connection unexpectedly closed")
+        self.assertGreaterEqual(email.available_at, before + timedelta(seconds=10))
+
+        OutboxEmail.objects.filter(pk=email.pk).update(available_at=timezone.now())
+        self.send_outbox("--backoff", "10")
+        email.refresh_from_db()
+
+        self.assertEqual(email.attempts, 2)
+        self.assertGreaterEqual(email.available_at, before + timedelta(seconds=20))
+
+    @patch.object(EmailMessage, "send", side_effect=SMTPException("Mailbox unavailable"))
+    def test_give_up_after_max_attempts_fail(self, mock_send):
+        email = self.create_email(attempts=2)
+
+        self.send_outbox("--max-attempts", "3")
+        email.refresh_from_db()
+
+        self.assertEqual(email.status, OutboxEmail.Status.FAILED)
+        self.assertEqual(email.attempts, 3)
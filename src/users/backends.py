@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from rest_framework.request import Request
+
+from users.hashing import hash_password, verify_password
+
+User = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ``ModelBackend`` checking passwords in the hashing pool rather than in the request thread.
+
+    Hashes made with an outdated hasher or iteration count are replaced on a successful login, as Django does.
+    Logins outside the API, such as the admin's, have no way to answer a full pool with a 503 and are checked
+    in the request thread by ``ModelBackend``.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if not isinstance(request, Request):
+            return super().authenticate(request, username=username, password=password, **kwargs)
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Hashing anyway keeps an unknown username as slow as a wrong password.
+            hash_password(password)
+            return None
+
+        valid, upgraded = verify_password(password, user.password)
+        if not valid or not self.user_can_authenticate(user):
+            return None
+        if upgraded is not None:
+            user.password = upgraded
+            user.save(update_fields=["password"])
+        return user
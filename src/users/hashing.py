@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-ins in progress, try again shortly."
+    default_code = "hashing_unavailable"
+
+    def __init__(self, wait):
+        super().__init__()
+        # Sent as Retry-After by the exception handler.
+        self.wait = wait
+
+
+def percentiles(samples):
+    values = sorted(samples)
+    result = {}
+    for name, percent in (("p50", 50), ("p95", 95), ("max", 100)):
+        value = values[min(len(values) - 1, round(percent / 100 * (len(values) - 1)))] if values else None
+        result[name] = None if value is None else round(value * 1000, 2)
+    return result
+
+
+class HashingPool:
+    """
+    Runs password hashing on ``workers`` dedicated threads instead of the request threads.
+
+    PBKDF2 releases the GIL, so hashes run in parallel without holding up the threads serving other requests, and
+    at most ``workers`` cores ever go to hashing. Callers beyond the workers wait in a queue of ``queue_size``; once
+    that is full, requests are rejected at once instead of tying up request workers behind a login surge.
+    """
+
+    def __init__(self, workers, queue_size, retry_after=1, samples=1000):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.lock = threading.Lock()
+        self.in_flight = self.completed = self.rejected = 0
+        self.waits = deque(maxlen=samples)
+        self.durations = deque(maxlen=samples)
+
+    def run(self, func, *args):
+        """Run ``func(*args)`` on the pool and return its result, or raise ``HashingUnavailable`` when it is full."""
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise HashingUnavailable(wait=self.retry_after)
+        with self.lock:
+            self.in_flight += 1
+        try:
+            return self.executor.submit(self.timed, time.perf_counter(), func, *args).result()
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+            self.slots.release()
+
+    def timed(self, queued, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with self.lock:
+                self.completed += 1
+                self.waits.append(started - queued)
+                self.durations.append(finished - started)
+
+    def stats(self):
+        """Describe the pool: its size, load and the latency of recent hashes and of their wait in the queue."""
+        with self.lock:
+            waits, durations = list(self.waits), list(self.durations)
+            stats = {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+        return {**stats, "queue_wait_ms": percentiles(waits), "hash_ms": percentiles(durations)}
+
+
+@lru_cache(maxsize=None)
+def get_pool():
+    return HashingPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE)
+
+
+def hash_password(password):
+    return get_pool().run(make_password, password)
+
+
+def check_and_upgrade(password, encoded):
+    upgraded = []
+    valid = check_password(password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+    return valid, upgraded[0] if upgraded else None
+
+
+def verify_password(password, encoded):
+    """
+    Check ``password`` against ``encoded`` in the pool.
+
+    Returns whether it matches and, when ``encoded`` was made with an outdated hasher or iteration count, the
+    password hashed with the current settings, computed in the same pool slot.
+    """
+    return get_pool().run(check_and_upgrade, password, encoded)
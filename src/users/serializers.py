@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from users.hashing import hash_password
+
 User = get_user_model()
 
 
@@ -15,6 +17,8 @@ class UserCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         password = validated_data.pop("password")
         user = User(**validated_data)
-        user.set_password(password)
+        user.password = hash_password(password)
+        # As set_password does, so the password validators are told about the new password after the save.
+        user._password = password
         user.save()
         return user
@@ -1,8 +1,16 @@
+import threading
+import time
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from users.hashing import HashingPool
+
 User = get_user_model()
 
 
@@ -27,6 +35,10 @@ class UserCreateUserViewTest(APITestCase):
         }
         cls.existing_user = User.objects.create(**cls.existing_user_data)
 
+    def setUp(self):
+        # Sign-ups are throttled per IP, and every test client shares one.
+        cache.clear()
+
     def test_create_user_success(self):
         response = self.client.post(self.url, self.data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -158,3 +170,119 @@ class UserAuthenticationTest(APITestCase):
             response.data,
             {"message": "Validation error", "errors": {"detail": "Token is invalid", "code": "token_not_valid"}},
         )
+
+
+class PasswordHashingPoolTest(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.url_token = reverse("token_obtain_pair")
+        cls.auth_data = {"username": "existing_user", "password": "strongpassword123"}
+        cls.user = User.objects.create_user(email="test@existing.com", **cls.auth_data)
+        cls.admin = User.objects.create_user(
+            username="admin", email="admin@example.com", password="testpass123", is_staff=True
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.pool = HashingPool(workers=1, queue_size=1)
+        for target in ("users.hashing.get_pool", "users.views.get_pool"):
+            patcher = patch(target, return_value=self.pool)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.pool.executor.shutdown)
+
+    def test_login_hashes_in_pool_success(self):
+        response = self.client.post(self.url_token, self.auth_data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.pool.completed, 1)
+
+        response = self.client.post(self.url_token, {"username": "unknown", "password": "pass"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        # Unknown usernames are hashed too, so they take as long as wrong passwords.
+        self.assertEqual(self.pool.completed, 2)
+
+    def test_signup_hashes_in_pool_success(self):
+        data = {
+            "username": "newuser",
+            "first_name": "New",
+            "last_name": "User",
+            "email": "new@example.com",
+            "password": "strongpassword123",
+        }
+        with patch("django.contrib.auth.password_validation.password_changed") as password_changed:
+            response = self.client.post(reverse("user-create"), data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.pool.completed, 1)
+        password_changed.assert_called_once_with("strongpassword123", User.objects.get(username="newuser"))
+        self.assertTrue(User.objects.get(username="newuser").check_password("strongpassword123"))
+
+    def test_login_upgrades_outdated_hash_success(self):
+        User.objects.filter(pk=self.user.pk).update(password=make_password("strongpassword123", hasher="pbkdf2_sha1"))
+
+        response = self.client.post(self.url_token, self.auth_data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        password = User.objects.get(pk=self.user.pk).password
+        self.assertTrue(password.startswith("pbkdf2_sha256$"))
+        self.assertEqual(self.client.post(self.url_token, self.auth_data, format="json").status_code, 200)
+
+    def test_saturated_pool_rejected_fail(self):
+        release = threading.Event()
+        threads = [threading.Thread(target=self.pool.run, args=(release.wait,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while self.pool.in_flight < 2:
+            time.sleep(0.01)
+
+        response = self.client.post(self.url_token, self.auth_data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(response.data, {"message": "Too many sign-ins in progress, try again shortly."})
+        self.assertEqual(self.pool.rejected, 1)
+
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.client.post(self.url_token, self.auth_data, format="json").status_code, 200)
+
+    def test_admin_login_saturated_pool_success(self):
+        release = threading.Event()
+        threads = [threading.Thread(target=self.pool.run, args=(release.wait,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while self.pool.in_flight < 2:
+            time.sleep(0.01)
+
+        response = self.client.post(reverse("admin:login"), {"username": "admin", "password": "testpass123"})
+
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(self.pool.rejected, 0)
+
+    def test_hashing_stats_success(self):
+        self.client.post(self.url_token, self.auth_data, format="json")
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.get(reverse("user-hashing-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {key: response.data[key] for key in ("workers", "queue_size", "in_flight", "completed", "rejected")},
+            {"workers": 1, "queue_size": 1, "in_flight": 0, "completed": 1, "rejected": 0},
+        )
+        self.assertGreater(response.data["hash_ms"]["p50"], 0)
+        self.assertGreaterEqual(response.data["queue_wait_ms"]["max"], 0)
+
+    def test_hashing_stats_not_staff_fail(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse("user-hashing-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
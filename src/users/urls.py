@@ -1,7 +1,8 @@
 from django.urls import path
 
-from users.views import UserCreateView
+from users.views import PasswordHashingStatsView, UserCreateView
 
 urlpatterns = [
     path("create/", UserCreateView.as_view(), name="user-create"),
+    path("hashing-stats/", PasswordHashingStatsView.as_view(), name="user-hashing-stats"),
 ]
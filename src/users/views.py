@@ -1,7 +1,12 @@
 from django.contrib.auth import get_user_model
 from rest_framework.generics import GenericAPIView
 from rest_framework.mixins import CreateModelMixin
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from event_management.throttling import UserCreateRateThrottle
+from users.hashing import get_pool
 from users.serializers import UserCreateSerializer
 
 User = get_user_model()
@@ -12,6 +17,16 @@ class UserCreateView(CreateModelMixin, GenericAPIView):
 
     queryset = User.objects.none()
     serializer_class = UserCreateSerializer
+    throttle_classes = [UserCreateRateThrottle]
 
     def post(self, request, *args, **kwargs):
         return self.create(request, *args, **kwargs)
+
+
+class PasswordHashingStatsView(APIView):
+    """API endpoint reporting the load and latency of the password hashing pool"""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_pool().stats())